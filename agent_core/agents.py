@@ -1,4 +1,5 @@
 from pathlib import Path
+import functools
 import re
 import json
 
@@ -8,8 +9,8 @@ from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
 from pydantic import BaseModel, Field
 
-from .fetch_tool import fetch_page_content
-from .tools import get_date, get_previous_research_result, get_token_budget_info, read_notes, take_notes, verify_urls, youtube_search_tool, grok_x_search
+from .fetch_tool import fetch_page_content, fetch_page_content_async
+from .tools import get_date, get_previous_research_result, get_token_budget_info, read_notes, take_notes, verify_urls, youtube_search_tool, youtube_search_tool_async, grok_x_search
 
 
 PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
@@ -88,6 +89,18 @@ class GoogleSearchAgentTool(AgentTool):
         }
 
 
+def _as_async_tool(func, async_func):
+    """
+    Expose an awaitable implementation under a sync tool's name, docstring and signature,
+    so the tool call doesn't block the runner's event loop.
+    """
+    @functools.wraps(func)
+    async def tool(**kwargs):
+        return await async_func(**kwargs)
+
+    return tool
+
+
 google_search_only_agent = Agent(
     name="google_search_agent",
     model="gemini-3-flash-preview",
@@ -116,14 +129,14 @@ research_agent = Agent(
         GoogleSearchAgentTool(agent=google_search_only_agent),
         AgentToolWithTokenMessage(agent=youtube_viewer_agent),
         grok_x_search,
-        fetch_page_content,
+        _as_async_tool(fetch_page_content, fetch_page_content_async),
         get_date,
         get_previous_research_result,
         get_token_budget_info,
         read_notes,
         take_notes,
         verify_urls,
-        youtube_search_tool,
+        _as_async_tool(youtube_search_tool, youtube_search_tool_async),
     ],
     instruction=_load_prompt("research_agent_prompt.md").replace("<Sub_Topic_List>", _load_prompt("sub_topic_list.md")),
 )
\ No newline at end of file
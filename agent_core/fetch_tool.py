@@ -1,9 +1,13 @@
 import asyncio
+import atexit
 import threading
 import tempfile
 from typing import List, Dict, Any, Tuple
 from collections import defaultdict
-from urllib.parse import urlparse
+from contextlib import aclosing, asynccontextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urlsplit, urlunsplit
 import os
 import time
 import random
@@ -15,11 +19,26 @@ from .tools import get_token_budget_info
 
 # Content size limit for fetched pages (in characters) - ~50KB of text
 MAX_CONTENT_SIZE = 50000
+TRUNCATION_SUFFIX = "\n\n[Content truncated...]"
+
+# Crawl concurrency bounds (more pages than this just trades throughput for timeouts)
+MAX_CRAWL_CONCURRENCY = int(os.getenv("CRAWL4AI_CONCURRENCY", "8"))  # Cap on max_parallel, whatever the agent asks for
+# Wall-clock seconds per URL across the batched pass, browser retries and fallbacks, counted from the
+# start of the batch. Every URL starts with the batch, so this also bounds the whole call.
+URL_TIME_BUDGET = float(os.getenv("CRAWL_PER_URL_TIMEOUT", "180"))
+FIRST_PASS_BUDGET_SHARE = 0.75  # Share of the budget the batched pass may use; the rest is left for retries/fallbacks
+CRAWL_MEMORY_THRESHOLD_PERCENT = float(os.getenv("CRAWL4AI_MEMORY_THRESHOLD", "80"))  # Stop opening new pages above this system memory %
+CRAWL_MEMORY_RECOVERY_PERCENT = CRAWL_MEMORY_THRESHOLD_PERCENT - 10  # ...and resume once memory drops back below this
+CRAWL_MEMORY_WAIT_TIMEOUT = 30  # Seconds the batch may stall on memory before falling back to per-URL crawls
+BROWSER_ATTEMPT_TIMEOUT = 60  # Seconds per browser retry (page_timeout only covers navigation, not extraction)
 
 # Domain rate limiting configuration
 DOMAIN_MIN_DELAY = 2.0  # Minimum seconds between requests to the same domain
 DOMAIN_MAX_DELAY = 4.0  # Maximum seconds (for jitter) between requests to the same domain
 DOMAIN_MAX_CONCURRENT = 2  # Max concurrent requests per domain
+CURL_CONNECT_TIMEOUT = 5  # Seconds for curl_cffi to connect before giving up on a host
+CURL_SESSION_RESET_TIMEOUTS = 3  # Back-to-back timeouts after which a thread's curl_cffi session is rebuilt
+CURL_MAX_BODY_BYTES = 4 * 1024 * 1024  # Stop downloading a page past this; far more HTML than MAX_CONTENT_SIZE of text needs
 
 # Wayback Machine rate limiting (archive.org can block aggressive scraping)
 ARCHIVE_MIN_DELAY = 3.0  # Minimum seconds between archive.org requests
@@ -44,9 +63,41 @@ KNOWN_BLOCKED_DOMAINS = {
     "medium.com": "Paywall - try archive only",
 }
 
-# Module-level curl_cffi session pool (lazy init for connection reuse)
-_curl_session = None
-_curl_session_lock = threading.Lock()
+# In-process caches (only touched from the crawl loop, so no locks needed)
+CRAWL_CONTENT_TTL = 900  # Seconds a successful fetch is reused for the same canonical URL
+CRAWL_CONTENT_CACHE_MAX = 256  # Most fetch results kept at once
+DOMAIN_STRATEGY_TTL = 3600  # Seconds to remember that a domain only works through a fallback
+_content_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # {canonical url: (expires_at, result)}
+_domain_strategy_cache: Dict[str, Tuple[float, str]] = {}  # {domain: (expires_at, "curl_cffi" | "archive")}
+
+# Query parameters that only track the click and never change the page
+# ("ref" is deliberately not here - GitHub uses it to select a branch)
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = frozenset(("fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ref_src", "ref_url"))
+
+# Domains that serve complete static HTML - fetched with curl_cffi first, browser only if that fails
+# (plain-text hosts like raw.githubusercontent.com don't belong here: curl_cffi only accepts HTML)
+STATIC_CONTENT_DOMAINS = (
+    "arxiv.org",
+    "news.ycombinator.com",
+    "wikipedia.org",
+)
+
+# curl_cffi sessions for connection reuse, one per worker thread (a Session's curl handle
+# isn't safe to drive from several threads at once)
+_curl_sessions = threading.local()
+
+# Background event loop hosting a persistent AsyncWebCrawler (lazy init, reused across
+# fetch_page_content calls so the browser is only launched once per process)
+_crawl_loop: asyncio.AbstractEventLoop | None = None
+_crawl_loop_lock = threading.Lock()
+_shared_crawler = None
+_shared_crawler_lock: asyncio.Lock | None = None
+_shared_crawler_pages = 0  # Pages crawled by the current browser (recycled after BROWSER_MAX_PAGES)
+_active_crawls = 0  # Batches currently using the shared browser
+BROWSER_MAX_PAGES = int(os.getenv("CRAWL4AI_BROWSER_MAX_USAGE", "50"))
+# Playwright error text for a browser that crashed, was closed or lost its connection
+DEAD_BROWSER_ERRORS = ("has been closed", "browser closed", "target closed", "target crashed", "connection closed", "disconnected")
 
 # User-Agent + TLS fingerprint pairs (matched by OS for consistency)
 # Format: (User-Agent, curl_cffi impersonate profile)
@@ -54,7 +105,7 @@ _curl_session_lock = threading.Lock()
 # curl_cffi 0.8+ supports: chrome131, chrome133a, chrome136, safari180, safari184, safari260,
 # safari180_ios, safari184_ios, safari260_ios, chrome131_android
 # Check available profiles: https://github.com/yifeikong/curl_cffi#supported-impersonate-targets
-USER_AGENT_PROFILES = [
+USER_AGENT_PROFILES = (
     # Desktop - Chrome on Mac (2025/2026 versions)
     ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36", "chrome136"),
     ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36", "chrome133a"),
@@ -77,11 +128,11 @@ USER_AGENT_PROFILES = [
     ("Mozilla/5.0 (iPhone; CPU iPhone OS 26_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/26.0 Mobile/15E148 Safari/604.1", "safari260_ios"),
     ("Mozilla/5.0 (iPhone; CPU iPhone OS 18_4 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.4 Mobile/15E148 Safari/604.1", "safari184_ios"),
     ("Mozilla/5.0 (iPhone; CPU iPhone OS 18_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.0 Mobile/15E148 Safari/604.1", "safari180_ios"),
-]
+)
 
 # Realistic referer headers to mimic traffic from search/social
 # Note: Twitter/X (t.co) removed as it can trigger extra scrutiny on some sites
-REFERER_SOURCES = [
+REFERER_SOURCES = (
     "https://www.google.com/",
     "https://www.google.com/search?q=",
     "https://www.bing.com/search?q=",
@@ -89,10 +140,10 @@ REFERER_SOURCES = [
     "https://news.ycombinator.com/",
     "https://duckduckgo.com/",
     None,  # Sometimes no referer is more natural
-]
+)
 
 # Common viewport sizes for fingerprint randomization
-VIEWPORT_SIZES = [
+VIEWPORT_SIZES = (
     (1920, 1080),
     (1366, 768),
     (1440, 900),
@@ -100,7 +151,7 @@ VIEWPORT_SIZES = [
     (1280, 720),
     (1600, 900),
     (2560, 1440),
-]
+)
 
 # Phrases that indicate a soft block (bot detection page, not actual 404)
 SOFT_BLOCK_INDICATORS = [
@@ -149,6 +200,60 @@ SOFT_BLOCK_INDICATORS = [
 ]
 
 
+def _get_cached_content(url: str) -> Dict[str, Any] | None:
+    """Get a recent successful fetch of this URL (or another spelling of it), if any."""
+    key = _canonical_url(url)
+    entry = _content_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.time():
+        del _content_cache[key]
+        return None
+    return entry[1]
+
+
+def _cache_content(url: str, result: Dict[str, Any]) -> None:
+    """Keep a successful fetch for CRAWL_CONTENT_TTL seconds."""
+    key = _canonical_url(url)
+    now = time.time()
+    # Re-insert so the dict stays in expiry order, then drop expired entries and anything past
+    # the size cap from the front - the scheduler process is long-lived
+    _content_cache.pop(key, None)
+    _content_cache[key] = (now + CRAWL_CONTENT_TTL, result)
+    while _content_cache:
+        oldest = next(iter(_content_cache))
+        if _content_cache[oldest][0] >= now and len(_content_cache) <= CRAWL_CONTENT_CACHE_MAX:
+            break
+        del _content_cache[oldest]
+
+
+def _get_domain_strategy(url: str) -> str | None:
+    """Get the fallback fetcher that recently worked for this URL's domain (the browser didn't)."""
+    domain = urlparse(url).netloc.lower()
+    entry = _domain_strategy_cache.get(domain)
+    if entry is None:
+        return None
+    if entry[0] < time.time():
+        del _domain_strategy_cache[domain]
+        return None
+    return entry[1]
+
+
+def _remember_domain_strategy(url: str, fetcher: str) -> None:
+    """Record which fetcher worked for a domain; a browser success clears the preference."""
+    domain = urlparse(url).netloc.lower()
+    if fetcher == "crawl4ai":
+        _domain_strategy_cache.pop(domain, None)
+    else:
+        _domain_strategy_cache[domain] = (time.time() + DOMAIN_STRATEGY_TTL, fetcher)
+
+
+def _is_static_content_domain(url: str) -> bool:
+    """Check if URL is from a domain that doesn't need a browser to render its content."""
+    domain = urlparse(url).netloc.lower()
+    return any(static_domain in domain for static_domain in STATIC_CONTENT_DOMAINS)
+
+
 def _get_domain_delays(domain: str) -> Tuple[float, float]:
     """Get domain-specific rate limit delays, falling back to defaults."""
     for pattern, delays in DOMAIN_SPECIFIC_DELAYS.items():
@@ -170,6 +275,22 @@ def _is_known_blocked_domain(url: str) -> Tuple[bool, str | None]:
     return False, None
 
 
+# Adaptive per-domain backoff (AIMD): throttling responses multiply a domain's delays,
+# each successful response walks the multiplier back down
+THROTTLE_STATUS_CODES = frozenset((429, 502, 503))
+DOMAIN_BACKOFF_MAX = 8.0
+DOMAIN_BACKOFF_RECOVERY = 0.5
+
+
+@lru_cache(maxsize=2048)
+def _url_domain(url: str) -> str:
+    """Lowercased netloc of a URL (memoized: retries and the first pass look up the same URLs)."""
+    try:
+        return urlparse(url).netloc.lower()
+    except Exception:
+        return url
+
+
 class DomainRateLimiter:
     """Rate limiter that ensures we don't overwhelm individual domains."""
 
@@ -179,49 +300,85 @@ class DomainRateLimiter:
         self.max_concurrent = max_concurrent
         self._last_request_time: Dict[str, float] = defaultdict(float)
         self._domain_semaphores: Dict[str, asyncio.Semaphore] = {}
-        self._lock = asyncio.Lock()
+        self._backoff: Dict[str, float] = defaultdict(lambda: 1.0)
 
     def _get_domain(self, url: str) -> str:
         """Extract domain from URL."""
-        try:
-            parsed = urlparse(url)
-            return parsed.netloc.lower()
-        except Exception:
-            return url
+        return _url_domain(url)
 
-    async def _get_semaphore(self, domain: str) -> asyncio.Semaphore:
+    def _get_semaphore(self, domain: str) -> asyncio.Semaphore:
         """Get or create a semaphore for a domain."""
-        async with self._lock:
-            if domain not in self._domain_semaphores:
-                self._domain_semaphores[domain] = asyncio.Semaphore(self.max_concurrent)
-            return self._domain_semaphores[domain]
+        # No lock needed: all callers run on one event loop and nothing here awaits
+        semaphore = self._domain_semaphores.get(domain)
+        if semaphore is None:
+            semaphore = self._domain_semaphores[domain] = asyncio.Semaphore(self.max_concurrent)
+        return semaphore
 
-    async def acquire(self, url: str) -> None:
-        """Acquire permission to make a request to the given URL's domain."""
+    async def acquire(self, url: str, delay: bool = True) -> None:
+        """
+        Acquire permission to make a request to the given URL's domain.
+        With delay=False only the per-domain concurrency cap applies (no spacing wait).
+        """
         domain = self._get_domain(url)
-        semaphore = await self._get_semaphore(domain)
+        semaphore = self._get_semaphore(domain)
 
         await semaphore.acquire()
+        if not delay:
+            return
 
-        # Get domain-specific delays or use defaults
+        # Get domain-specific delays or use defaults, stretched if the domain has been throttling us
         min_delay, max_delay = _get_domain_delays(domain)
+        backoff = self._backoff[domain]
+        min_delay, max_delay = min_delay * backoff, max_delay * backoff
 
-        # Enforce randomized delay between requests to the same domain (more human-like)
-        async with self._lock:
-            last_time = self._last_request_time[domain]
-            now = time.monotonic()
-            # Use random jitter between min and max delay for more human-like behavior
-            target_delay = random.uniform(min_delay, max_delay)
-            wait_time = max(0, target_delay - (now - last_time))
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-            self._last_request_time[domain] = time.monotonic()
+        # Enforce randomized delay between requests to the same domain (more human-like).
+        # The start slot is reserved before sleeping, so same-domain requests queue up behind
+        # each other while requests to other hosts are never held up.
+        now = time.monotonic()
+        # Use random jitter between min and max delay for more human-like behavior
+        target_delay = random.uniform(min_delay, max_delay)
+        start_at = max(now, self._last_request_time[domain] + target_delay)
+        self._last_request_time[domain] = start_at
+        wait_time = start_at - time.monotonic()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    def report(self, url: str, status_code: int | None) -> None:
+        """Feed a response status back: throttling doubles the domain's delays, success eases them."""
+        if not status_code:
+            return
+        domain = self._get_domain(url)
+        if status_code in THROTTLE_STATUS_CODES:
+            self._backoff[domain] = min(DOMAIN_BACKOFF_MAX, self._backoff[domain] * 2)
+        elif status_code < 400 and domain in self._backoff:
+            self._backoff[domain] = max(1.0, self._backoff[domain] - DOMAIN_BACKOFF_RECOVERY)
 
     async def release(self, url: str) -> None:
         """Release the domain semaphore after request completes."""
-        domain = self._get_domain(url)
-        semaphore = await self._get_semaphore(domain)
-        semaphore.release()
+        self._get_semaphore(self._get_domain(url)).release()
+
+    @asynccontextmanager
+    async def limit(self, url: str, delay: bool = True):
+        """Hold the URL's domain slot for the duration of the block."""
+        await self.acquire(url, delay)
+        try:
+            yield
+        finally:
+            await self.release(url)
+
+
+# Last-resort tag stripping when the HTML extractor fails
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Charset declared in the page itself, for responses whose Content-Type has none
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_SCAN_BYTES = 4096
+
+
+def _strip_tags(html: str) -> str:
+    """Crude text extraction: drop tags and collapse whitespace."""
+    return _WHITESPACE_RE.sub(' ', _TAG_RE.sub(' ', html)).strip()
 
 
 class SimpleHTMLTextExtractor:
@@ -235,7 +392,7 @@ class SimpleHTMLTextExtractor:
         def __init__(self):
             super().__init__()
             self.text_parts = []
-            self.skip_tags = {'script', 'style', 'noscript', 'header', 'footer', 'nav', 'aside'}
+            self.skip_tags = set(SimpleHTMLTextExtractor.SKIP_TAGS)
             self.current_skip = 0
             self.title = None
             self.in_title = False
@@ -263,15 +420,39 @@ class SimpleHTMLTextExtractor:
         def get_text(self) -> str:
             return '\n'.join(self.text_parts)
 
+    SKIP_TAGS = ('script', 'style', 'noscript', 'header', 'footer', 'nav', 'aside')
+
     @classmethod
     def extract(cls, html: str) -> Tuple[str, str | None]:
         """
         Extract text and title from HTML.
         Returns (text_content, title).
+        Parses with lxml (C, installed with crawl4ai) and falls back to html.parser
+        if lxml is unavailable or rejects the document.
         """
-        parser = cls._Parser()
-        parser.feed(html)
-        return parser.get_text(), parser.title
+        try:
+            return cls._extract_lxml(html)
+        except Exception:
+            parser = cls._Parser()
+            parser.feed(html)
+            return parser.get_text(), parser.title
+
+    @classmethod
+    def _extract_lxml(cls, html: str) -> Tuple[str, str | None]:
+        from lxml import etree
+        from lxml import html as lxml_html
+
+        root = lxml_html.document_fromstring(html)
+
+        title = None
+        title_el = root.find('.//title')
+        if title_el is not None and title_el.text is not None:
+            title = title_el.text.strip()
+
+        # Drop skipped subtrees (keeping the text that follows them) before walking the text nodes
+        etree.strip_elements(root, 'title', *cls.SKIP_TAGS, etree.Comment, etree.ProcessingInstruction, with_tail=False)
+        text_parts = [text for text in (t.strip() for t in root.itertext()) if text]
+        return '\n'.join(text_parts), title
 
 
 def _get_matched_profile() -> Tuple[str, str]:
@@ -297,22 +478,17 @@ def _is_soft_block(content: str, status_code: int | None) -> bool:
     if not content:
         return False
 
-    content_lower = content.lower()
-
-    # Check for soft block indicators
-    indicator_count = sum(1 for indicator in SOFT_BLOCK_INDICATORS if indicator in content_lower)
-
-    # If multiple indicators found, likely a block page
-    if indicator_count >= 2:
-        return True
-
-    # Very short content with any indicator is suspicious
-    if len(content) < 1000 and indicator_count >= 1:
-        return True
+    # Multiple indicators mean a block page; a single one is enough for very short content
+    # or a 403/404. Stop scanning as soon as the applicable threshold is reached.
+    threshold = 1 if len(content) < 1000 or status_code in (403, 404) else 2
 
-    # 403/404 with block indicators
-    if status_code in (403, 404) and indicator_count >= 1:
-        return True
+    content_lower = content.lower()
+    indicator_count = 0
+    for indicator in SOFT_BLOCK_INDICATORS:
+        if indicator in content_lower:
+            indicator_count += 1
+            if indicator_count >= threshold:
+                return True
 
     return False
 
@@ -329,11 +505,9 @@ def _get_cached_archive_result(url: str) -> Dict[str, Any] | None:
     Returns the cached result dict if valid, None otherwise.
     """
     cache_path = _get_archive_cache_path(url)
-    
-    if not os.path.exists(cache_path):
-        return None
-    
+
     try:
+        # Open directly rather than checking exists() first: a miss costs one failed open
         with open(cache_path, "r", encoding="utf-8") as f:
             cached_data = json.load(f)
         
@@ -353,6 +527,8 @@ def _get_cached_archive_result(url: str) -> Dict[str, Any] | None:
             "content": cached_data.get("content"),
             "fetcher": "archive_cached",
         }
+    except FileNotFoundError:
+        return None
     except (json.JSONDecodeError, OSError, KeyError):
         # Invalid cache file, remove it
         try:
@@ -513,8 +689,7 @@ def _fetch_from_archive(url: str, timeout: int = 20, max_retries: int = 1) -> Di
             try:
                 content, title = SimpleHTMLTextExtractor.extract(response.text)
             except Exception:
-                text = re.sub(r'<[^>]+>', ' ', response.text)
-                text = re.sub(r'\s+', ' ', text).strip()
+                text = _strip_tags(response.text)
                 if text and len(text) > 200:
                     truncated_text = _truncate_content(text)
                     _cache_archive_result(url, archive_url, None, truncated_text)
@@ -566,25 +741,44 @@ def _truncate_content(content: str, max_size: int = MAX_CONTENT_SIZE) -> str:
     if not content or len(content) <= max_size:
         return content
 
-    # Try to cut at a sentence boundary
-    truncated = content[:max_size]
-    last_period = truncated.rfind('. ')
-    last_newline = truncated.rfind('\n')
+    # Try to cut at a sentence boundary; bounded rfind avoids copying the prefix just to search it,
+    # and only the last 20% is scanned since an earlier boundary wouldn't be used anyway
+    min_cut = int(max_size * 0.8) + 1
+    last_period = content.rfind('. ', min_cut, max_size)
+    last_newline = content.rfind('\n', min_cut, max_size)
     cut_point = max(last_period, last_newline)
 
     if cut_point > max_size * 0.8:  # Only use boundary if it's not too far back
-        return truncated[:cut_point + 1] + "\n\n[Content truncated...]"
-    return truncated + "\n\n[Content truncated...]"
+        return content[:cut_point + 1] + TRUNCATION_SUFFIX
+    return content[:max_size] + TRUNCATION_SUFFIX
 
 
 def _get_curl_session():
-    """Get or create a reusable curl_cffi session for connection pooling."""
-    global _curl_session
-    with _curl_session_lock:
-        if _curl_session is None:
-            from curl_cffi import requests as curl_requests
-            _curl_session = curl_requests.Session()
-        return _curl_session
+    """Get or create this thread's reusable curl_cffi session for connection pooling."""
+    session = getattr(_curl_sessions, "session", None)
+    if session is None:
+        from curl_cffi import requests as curl_requests
+        session = _curl_sessions.session = curl_requests.Session()
+    return session
+
+
+def _record_curl_timeout():
+    """
+    Count a timeout against this thread's curl_cffi session. If they keep coming back to back,
+    drop the session so the next request starts on a fresh handle and connection pool instead
+    of a wedged one.
+    """
+    timeouts = getattr(_curl_sessions, "timeouts", 0) + 1
+    if timeouts >= CURL_SESSION_RESET_TIMEOUTS:
+        session = getattr(_curl_sessions, "session", None)
+        _curl_sessions.session = None
+        timeouts = 0
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+    _curl_sessions.timeouts = timeouts
 
 
 def _fetch_with_curl_cffi(url: str, timeout: int = 15, user_agent: str | None = None, impersonate: str | None = None) -> Dict[str, Any]:
@@ -628,15 +822,46 @@ def _fetch_with_curl_cffi(url: str, timeout: int = 15, user_agent: str | None =
         headers["Sec-Fetch-Site"] = "none"
 
     try:
+        from curl_cffi import CurlECode, CurlInfo
+        from curl_cffi.curl import CURL_WRITEFUNC_ERROR
+        from curl_cffi.requests.exceptions import RequestException as CurlRequestException
+
+        # Collect the body ourselves so oversized pages stop downloading at the cap
+        body = bytearray()
+
+        def _collect(chunk: bytes) -> int:
+            if not body:
+                # Headers are in by the first chunk: don't download bodies we'd discard anyway
+                content_type = session.curl.getinfo(CurlInfo.CONTENT_TYPE) or b""
+                if session.curl.getinfo(CurlInfo.RESPONSE_CODE) >= 400 or (
+                    b"text/html" not in content_type and b"application/xhtml" not in content_type
+                ):
+                    return CURL_WRITEFUNC_ERROR
+            room = CURL_MAX_BODY_BYTES - len(body)
+            body.extend(chunk[:room])
+            if len(chunk) > room:
+                return CURL_WRITEFUNC_ERROR  # Aborts the transfer, keeping what was read
+            return len(chunk)  # Anything else makes curl_cffi warn (and later versions fail)
+
         # Use session for connection pooling
         session = _get_curl_session()
-        response = session.get(
-            url,
-            headers=headers,
-            timeout=timeout,
-            allow_redirects=True,
-            impersonate=impersonate,  # Matched TLS fingerprint
-        )
+        # Fail fast on hosts that don't accept the connection, keeping the same overall budget
+        connect_timeout = min(CURL_CONNECT_TIMEOUT, timeout)
+        try:
+            response = session.get(
+                url,
+                headers=headers,
+                timeout=(connect_timeout, timeout - connect_timeout),  # curl_cffi caps the total at their sum
+                allow_redirects=True,
+                impersonate=impersonate,  # Matched TLS fingerprint
+                content_callback=_collect,
+            )
+        except CurlRequestException as e:
+            # Our own abort surfaces as a write error with the parsed response still attached
+            if e.code != CurlECode.WRITE_ERROR or e.response is None:
+                raise
+            response = e.response
+        _curl_sessions.timeouts = 0  # The session is getting answers
 
         if response.status_code >= 400:
             return {
@@ -654,13 +879,23 @@ def _fetch_with_curl_cffi(url: str, timeout: int = 15, user_agent: str | None =
                 "error": f"Non-HTML content type: {content_type}",
             }
 
+        # Header charset first, then a <meta> declaration near the top; no byte-level detection pass
+        encoding = response.charset_encoding
+        if not encoding:
+            match = _META_CHARSET_RE.search(body, 0, META_CHARSET_SCAN_BYTES)
+            encoding = match.group(1).decode("ascii") if match else "utf-8"
+        try:
+            html = body.decode(encoding, errors="replace")
+        except LookupError:  # Unknown charset name
+            html = body.decode("utf-8", errors="replace")
+        body.clear()  # Only the decoded copy is needed from here on
+
         # Parse HTML and extract text using shared extractor
         try:
-            content, title = SimpleHTMLTextExtractor.extract(response.text)
+            content, title = SimpleHTMLTextExtractor.extract(html)
         except Exception:
             # If parsing fails, try to extract text with regex fallback
-            text = re.sub(r'<[^>]+>', ' ', response.text)
-            text = re.sub(r'\s+', ' ', text).strip()
+            text = _strip_tags(html)
 
             # Check for soft block
             if _is_soft_block(text, response.status_code):
@@ -704,7 +939,8 @@ def _fetch_with_curl_cffi(url: str, timeout: int = 15, user_agent: str | None =
 
     except Exception as e:
         error_str = str(e).lower()
-        if "timeout" in error_str:
+        if "timeout" in error_str or "timed out" in error_str:  # curl reports "(28) Operation timed out"
+            _record_curl_timeout()
             return {"url": url, "status": "failure", "error": "timeout"}
         return {"url": url, "status": "failure", "error": str(e)}
 
@@ -723,19 +959,194 @@ def _normalize_url(url: str) -> str:
     return url
 
 
-def fetch_page_content(urls: list[str], max_parallel: int = 3) -> dict:
+def _is_tracking_param(name: str) -> bool:
+    """Check if a query parameter name only tracks the click."""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def _canonical_url(url: str) -> str:
     """
-    A tool for the agent to fetch page content from a list of URLs, and organize it in an LLM-friendly way.
-    Uses parallel fetching with retry logic and fallback mechanisms for robustness.
+    Dedupe/cache key for a URL, so the same article isn't fetched twice: tracking params and
+    in-page anchors are dropped and the scheme and host lowercased. Only a key - the URL
+    itself is fetched as given. Everything else (query encoding, userinfo, "#/route"
+    fragments of single-page apps) is kept verbatim, since it can select different content.
+    """
+    parts = urlsplit(url)
+    query = parts.query
+    if query:
+        params = query.split("&")
+        kept = [p for p in params if not _is_tracking_param(p.partition("=")[0])]
+        if len(kept) != len(params):
+            query = "&".join(kept)
+    userinfo, at, host = parts.netloc.rpartition("@")
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!")) else ""
+    return urlunsplit((parts.scheme.lower(), userinfo + at + host.lower(), parts.path, query, fragment))
+
+
+def _get_crawl_base_dir() -> str:
+    """
+    Pick the Crawl4AI base directory and return it. Prefers RAM-backed /dev/shm when it's
+    writable (Crawl4AI writes per-page temp files there); otherwise stays inside the
+    workspace (sandbox safe). An explicit CRAWL4_AI_BASE_DIRECTORY always wins.
+    """
+    crawl_base_dir = os.environ.get("CRAWL4_AI_BASE_DIRECTORY")
+    if not crawl_base_dir:
+        if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+            crawl_base_dir = "/dev/shm/.crawl4ai_cache"
+        else:
+            crawl_base_dir = os.path.join(os.getcwd(), ".crawl4ai_cache")
+        os.environ["CRAWL4_AI_BASE_DIRECTORY"] = crawl_base_dir
+    os.makedirs(crawl_base_dir, exist_ok=True)
+    return crawl_base_dir
 
-    Args:
-        urls (list[str]): A list of URLs to fetch content from.
-        max_parallel (int): Maximum number of URLs to fetch in parallel (default: 3).
-            Note: Each parallel fetch spawns a Chromium instance (~300-500MB RAM each).
-            Default of 3 is conservative for 16GB RAM environments (e.g., GitHub runners).
 
-    Returns:
-        A dict with 'web_page_content' (list of results) and 'token_usage_info'.
+def _build_browser_config():
+    """
+    Build the Crawl4AI browser config for the persistent shared browser.
+    The User-Agent is applied per batch on the run config instead.
+    """
+    from crawl4ai import BrowserConfig
+
+    # Randomize viewport for fingerprint evasion
+    viewport_width, viewport_height = _get_random_viewport()
+
+    # Add realistic referer header to mimic search/social traffic
+    referer = _get_random_referer()
+
+    headers = {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "DNT": "1",
+        "Upgrade-Insecure-Requests": "1",
+    }
+
+    if referer:
+        headers["Referer"] = referer
+
+    # Browser configuration - optimized for stealth and compatibility
+    # Try to enable stealth mode which patches navigator, WebGL fingerprints, etc.
+    browser_config_kwargs = {
+        "headless": True,
+        "verbose": False,
+        "text_mode": True,  # Optimized for text extraction
+        "headers": headers,
+        "extra_args": [
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-plugins",
+            "--no-first-run",
+            "--disable-background-networking",
+            "--disable-sync",
+            "--disable-translate",
+            "--disable-blink-features=AutomationControlled",  # Hide automation
+            "--disable-infobars",
+            f"--window-size={viewport_width},{viewport_height}",  # Randomized viewport
+        ],
+    }
+    # Abort ad/tracker, stylesheet and font requests before they download - text extraction
+    # doesn't need them. Only newer Crawl4AI versions have these options, so probe first
+    resource_blocking = {"avoid_ads": True, "avoid_css": True}
+    try:
+        BrowserConfig(**resource_blocking)
+        browser_config_kwargs.update(resource_blocking)
+    except TypeError:
+        pass
+
+    # Add stealth mode if available (patches navigator.webdriver, plugins, etc.)
+    # Some versions may have import issues, so we try it and fall back gracefully
+    try:
+        browser_config = BrowserConfig(**browser_config_kwargs, stealth=True)
+    except (TypeError, ImportError):
+        # Stealth mode not available in this version, use config without it
+        browser_config = BrowserConfig(**browser_config_kwargs)
+
+    return browser_config
+
+
+def _get_crawl_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the background event loop that runs every crawl (and hosts the shared crawler)."""
+    global _crawl_loop
+    with _crawl_loop_lock:
+        if _crawl_loop is None:
+            loop = asyncio.new_event_loop()
+            # One long-lived pool for every asyncio.to_thread fallback (curl_cffi, archive)
+            loop.set_default_executor(ThreadPoolExecutor(
+                max_workers=int(os.getenv("THREAD_POOL_SIZE", "8")),
+                thread_name_prefix="fetch_page_content",
+            ))
+            threading.Thread(target=loop.run_forever, name="crawl_loop", daemon=True).start()
+            atexit.register(_shutdown_crawl_loop)
+            _crawl_loop = loop
+        return _crawl_loop
+
+
+async def _get_shared_crawler():
+    """
+    Get or start the persistent AsyncWebCrawler. Must run on the crawl loop.
+    Returns None if the browser can't start (callers fall back to curl_cffi/archive);
+    the next call tries again.
+    """
+    global _shared_crawler, _shared_crawler_lock, _shared_crawler_pages
+    if _shared_crawler_lock is None:
+        _shared_crawler_lock = asyncio.Lock()
+
+    async with _shared_crawler_lock:
+        # Recycle a long-lived browser between batches to bound Chromium memory growth
+        if _shared_crawler is not None and _shared_crawler_pages >= BROWSER_MAX_PAGES and not _active_crawls:
+            await _discard_shared_crawler(_shared_crawler)
+        if _shared_crawler is None:
+            from crawl4ai import AsyncWebCrawler
+
+            crawler = AsyncWebCrawler(config=_build_browser_config(), base_directory=_get_crawl_base_dir())
+            try:
+                await crawler.start()
+            except Exception:
+                return None
+            _shared_crawler = crawler
+            _shared_crawler_pages = 0
+        return _shared_crawler
+
+
+def _is_dead_browser_error(error: BaseException) -> bool:
+    """Check if a crawl error means the shared Chromium (or its connection) is gone."""
+    message = str(error).lower()
+    return any(marker in message for marker in DEAD_BROWSER_ERRORS)
+
+
+async def _discard_shared_crawler(crawler) -> None:
+    """Drop a broken shared crawler (e.g. Chromium crashed) so the next call launches a fresh one."""
+    global _shared_crawler
+    if _shared_crawler is not crawler:
+        return  # Already replaced by another call
+    _shared_crawler = None
+    try:
+        await crawler.close()
+    except Exception:
+        pass
+
+
+def _shutdown_crawl_loop() -> None:
+    """Close the shared crawler and stop the crawl loop (registered with atexit)."""
+    global _shared_crawler
+    loop = _crawl_loop
+    if loop is None or not loop.is_running():
+        return
+    if _shared_crawler is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(_shared_crawler.close(), loop).result(timeout=10)
+        except Exception:
+            pass
+        _shared_crawler = None
+    loop.call_soon_threadsafe(loop.stop)
+
+
+async def fetch_page_content_async(urls: list[str], max_parallel: int = 3) -> dict:
+    """
+    Awaitable version of fetch_page_content for callers already running an event loop.
+    The crawl runs on the persistent crawl loop; awaiting it doesn't block the caller's loop.
     """
     import random
 
@@ -745,13 +1156,13 @@ def fetch_page_content(urls: list[str], max_parallel: int = 3) -> dict:
 
     # Normalize URLs - add https:// if missing
     urls = [_normalize_url(u) for u in urls]
-
-    # Ensure Crawl4AI writes inside the workspace (sandbox safe)
-    crawl_base_dir = os.environ.get("CRAWL4_AI_BASE_DIRECTORY")
-    if not crawl_base_dir:
-        crawl_base_dir = os.path.join(os.getcwd(), ".crawl4ai_cache")
-        os.environ["CRAWL4_AI_BASE_DIRECTORY"] = crawl_base_dir
-    os.makedirs(crawl_base_dir, exist_ok=True)
+    # Dedupe on the canonical form - agents often resubmit one article with different tracking params.
+    # The first spelling of each page is the one fetched.
+    unique_urls = {}
+    for u in urls:
+        unique_urls.setdefault(_canonical_url(u), u)
+    urls = list(unique_urls.values())
+    max_parallel = max(1, min(max_parallel, MAX_CRAWL_CONCURRENCY))
 
     # Retry configuration
     MAX_RETRIES = 2
@@ -764,69 +1175,15 @@ def fetch_page_content(urls: list[str], max_parallel: int = 3) -> dict:
         max_concurrent=DOMAIN_MAX_CONCURRENT
     )
 
-    async def _crawl_single_url_with_retry(url: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
-        """
-        Crawl a single URL with retry logic and fallback to curl_cffi-based fetcher.
-        Uses semaphore to limit concurrent browser instances and domain rate limiter
-        to prevent overwhelming individual domains.
-        """
-        # Check if this is a known blocked domain - skip directly to archive
-        is_blocked_domain, block_reason = _is_known_blocked_domain(url)
-        if is_blocked_domain:
-            # Skip browser and curl_cffi, go straight to archive
-            archive_result = await asyncio.to_thread(_fetch_from_archive, url)
-            if archive_result.get("status") == "success":
-                return archive_result
-            return {
-                "url": url,
-                "status": "failure",
-                "error": f"Known blocked domain ({block_reason}); Archive: {archive_result.get('error', 'failed')}",
-            }
-
+    def _build_run_config(user_agent: str):
+        """Build the Crawl4AI run config for one fetch_page_content call."""
         from crawl4ai import (
-            AsyncWebCrawler,
-            BrowserConfig,
             CrawlerRunConfig,
             CacheMode,
             DefaultMarkdownGenerator,
             PruningContentFilter,
         )
 
-        # Pick profile ONCE per URL - real browsers don't change UA mid-session
-        # This profile will be used consistently across all retries and fallbacks
-        url_user_agent, url_impersonate = _get_matched_profile()
-
-        # Randomize viewport for fingerprint evasion
-        viewport_width, viewport_height = _get_random_viewport()
-
-        # Browser configuration - optimized for stealth and compatibility
-        # Try to enable stealth mode which patches navigator, WebGL fingerprints, etc.
-        browser_config_kwargs = {
-            "headless": True,
-            "verbose": False,
-            "text_mode": True,  # Optimized for text extraction
-            "extra_args": [
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-extensions",
-                "--disable-plugins",
-                "--no-first-run",
-                "--disable-background-networking",
-                "--disable-sync",
-                "--disable-translate",
-                "--disable-blink-features=AutomationControlled",  # Hide automation
-                "--disable-infobars",
-                f"--window-size={viewport_width},{viewport_height}",  # Randomized viewport
-            ],
-        }
-        # Add stealth mode if available (patches navigator.webdriver, plugins, etc.)
-        # Some versions may have import issues, so we try it and fall back gracefully
-        try:
-            browser_config = BrowserConfig(**browser_config_kwargs, stealth=True)
-        except (TypeError, ImportError):
-            # Stealth mode not available in this version, use config without it
-            browser_config = BrowserConfig(**browser_config_kwargs)
-
         # Content pruning - balanced for quality and size
         md_generator = DefaultMarkdownGenerator(
             content_filter=PruningContentFilter(
@@ -934,6 +1291,9 @@ def fetch_page_content(urls: list[str], max_parallel: int = 3) -> dict:
             verbose=False,
             markdown_generator=md_generator,
             excluded_tags=["script", "style", "noscript", "iframe", "svg", "canvas", "video", "audio", "img", "picture", "figure"],
+            # Skip image discovery/scoring entirely (images are dropped from the markdown anyway;
+            # the browser config's text_mode/avoid_ads/avoid_css stop those bytes at the network layer)
+            exclude_all_images=True,
             remove_overlay_elements=True,
             # Execute JS to dismiss cookie banners and scroll for lazy loading
             js_code=page_interaction_js,
@@ -941,91 +1301,141 @@ def fetch_page_content(urls: list[str], max_parallel: int = 3) -> dict:
             wait_for=f"js:{wait_for_content_js}",
             page_timeout=45000,  # 45 second timeout for slow JS sites
             delay_before_return_html=2.5,  # Extra wait for lazy-loaded content after scroll
+            user_agent=user_agent,  # Applied to the shared browser's pages for this batch
         )
 
-        # Add realistic referer header to mimic search/social traffic
-        referer = _get_random_referer()
+        return run_config
 
-        headers = {
-            "User-Agent": url_user_agent,  # Use consistent profile for this URL
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Upgrade-Insecure-Requests": "1",
-        }
+    def _crawl_result_to_dict(url: str, crawl_result) -> Tuple[Dict[str, Any] | None, str | None, bool]:
+        """
+        Convert a Crawl4AI result into a result dict.
+        Returns (result, error, retry): result is set on success; otherwise error says
+        what went wrong and retry says whether another browser attempt is worthwhile.
+        """
+        status_code = getattr(crawl_result, "status_code", None) if crawl_result else None
+
+        # Error pages (404s, paywall 403s, 5xx) skip content extraction entirely
+        if status_code and status_code >= 400:
+            error = f"HTTP {status_code}"
+            if getattr(crawl_result, "error_message", None):
+                error += f": {crawl_result.error_message}"
+            # 403/404/5xx go straight to the fallbacks; others (e.g. 429) are worth a retry
+            return None, error, status_code not in (403, 404) and status_code < 500
+
+        if crawl_result and crawl_result.success:
+            md = crawl_result.markdown
+            content_text = (
+                (getattr(md, "fit_markdown", None) or getattr(md, "raw_markdown", None) if md else None)
+                or getattr(crawl_result, "cleaned_html", None)
+                or ""
+            )
+            if content_text:
+                content_text = _truncate_content(content_text.strip())
 
-        if referer:
-            headers["Referer"] = referer
+            # Check for soft blocks (bot detection pages that return 200)
+            if _is_soft_block(content_text, status_code):
+                return None, "soft_block_detected", False  # Try fallbacks
+
+            # Check if we got meaningful content
+            if content_text and len(content_text) > 100:
+                return {
+                    "url": url,
+                    "redirected_url": getattr(crawl_result, "redirected_url", None) or url,
+                    "title": (crawl_result.metadata or {}).get("title") if crawl_result.metadata else None,
+                    "status": "success",
+                    "status_code": status_code,
+                    "content": content_text,
+                    "fetcher": "crawl4ai",
+                }, None, False
+
+        # Crawl didn't return meaningful content
+        error = getattr(crawl_result, "error_message", "No content extracted") if crawl_result else "Empty result"
+        return None, error, True
+
+    async def _curl_fetch(url: str, user_agent: str, impersonate: str) -> Dict[str, Any]:
+        """curl_cffi fetch in a worker thread, capped per domain so one slow host can't tie up the pool."""
+        async with domain_limiter.limit(url, delay=False):
+            return await asyncio.to_thread(_fetch_with_curl_cffi, url, 15, user_agent, impersonate)
+
+    async def _crawl_single_url_with_retry(
+        url: str,
+        crawler,
+        run_config,
+        semaphore: asyncio.Semaphore,
+        profile: Tuple[str, str],
+        first_attempt: Tuple[Dict[str, Any] | None, str | None, bool] | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Crawl a single URL with retry logic and fallback to curl_cffi-based fetcher.
+        `first_attempt` is the already-processed result of the batched arun_many pass;
+        remaining attempts use the shared crawler, a semaphore to limit concurrent
+        browser pages and domain rate limiter to prevent overwhelming individual domains.
+        """
+        global _shared_crawler_pages
+
+        # Check if this is a known blocked domain - skip directly to archive
+        is_blocked_domain, block_reason = _is_known_blocked_domain(url)
+        if is_blocked_domain:
+            # Skip browser and curl_cffi, go straight to archive
+            archive_result = await asyncio.to_thread(_fetch_from_archive, url)
+            if archive_result.get("status") == "success":
+                return archive_result
+            return {
+                "url": url,
+                "status": "failure",
+                "error": f"Known blocked domain ({block_reason}); Archive: {archive_result.get('error', 'failed')}",
+            }
+
+        # Same UA/TLS profile as the browser for the whole batch
+        # (real browsers don't change UA mid-session)
+        url_user_agent, url_impersonate = profile
 
         last_error = None
 
-        # Try browser-based crawl with retries
-        for attempt in range(MAX_RETRIES + 1):
-            try:
-                # Acquire domain rate limit before making request
-                await domain_limiter.acquire(url)
+        # Static fast path: no Playwright page for sites that ship complete HTML
+        static_result = None
+        if _is_static_content_domain(url):
+            static_result = await _curl_fetch(url, url_user_agent, url_impersonate)
+            if static_result.get("status") == "success":
+                return static_result
+
+        # Skip the browser for domains where only a fallback worked recently
+        preferred_fetcher = _get_domain_strategy(url)
+
+        # Try browser-based crawl with retries (skipped if the shared browser failed to start)
+        if crawler is None:
+            last_error = "Browser unavailable"
+        elif preferred_fetcher:
+            last_error = f"Skipped (only {preferred_fetcher} worked for this domain recently)"
+        for attempt in range(MAX_RETRIES + 1 if crawler is not None and not preferred_fetcher else 0):
+            if attempt == 0 and first_attempt is not None:
+                result, last_error, retry = first_attempt
+            else:
                 try:
-                    async with semaphore:
-                        async with AsyncWebCrawler(
-                            config=browser_config,
-                            base_directory=crawl_base_dir,
-                            headers=headers,
-                        ) as crawler:
-                            crawl_container = await crawler.arun(url=url, config=run_config)
-                            crawl_result = crawl_container[0] if len(crawl_container) else None
-
-                            if crawl_result and crawl_result.success:
-                                content_text = ""
-                                if crawl_result.markdown:
-                                    content_text = getattr(
-                                        crawl_result.markdown,
-                                        "fit_markdown",
-                                        None,
-                                    ) or getattr(
-                                        crawl_result.markdown,
-                                        "raw_markdown",
-                                        None,
-                                    ) or ""
-
-                                if not content_text and hasattr(crawl_result, "cleaned_html"):
-                                    content_text = crawl_result.cleaned_html or ""
-
-                                content_text = _truncate_content(content_text.strip()) if content_text else ""
-
-                                # Check for soft blocks (bot detection pages that return 200)
-                                status_code = getattr(crawl_result, "status_code", None)
-                                if _is_soft_block(content_text, status_code):
-                                    last_error = "soft_block_detected"
-                                    break  # Try fallbacks
-
-                                # Check if we got meaningful content
-                                if content_text and len(content_text) > 100:
-                                    return {
-                                        "url": url,
-                                        "redirected_url": getattr(crawl_result, "redirected_url", None) or url,
-                                        "title": (crawl_result.metadata or {}).get("title") if crawl_result.metadata else None,
-                                        "status": "success",
-                                        "status_code": status_code,
-                                        "content": content_text,
-                                        "fetcher": "crawl4ai",
-                                    }
-
-                            # Crawl didn't return meaningful content
-                            status_code = getattr(crawl_result, "status_code", None) if crawl_result else None
-                            last_error = getattr(crawl_result, "error_message", "No content extracted") if crawl_result else "Empty result"
-
-                            # For 403/404/5xx, try fallback immediately instead of retrying
-                            if status_code and (status_code == 403 or status_code == 404 or status_code >= 500):
-                                break
-                finally:
-                    await domain_limiter.release(url)
-
-            except Exception as e:
-                last_error = str(e)
+                    # Hold a domain rate limit slot while making the request
+                    async with domain_limiter.limit(url):
+                        async with semaphore:
+                            _shared_crawler_pages += 1  # Retries open pages too; counts toward recycling
+                            crawl_container = await asyncio.wait_for(
+                                crawler.arun(url=url, config=run_config), timeout=BROWSER_ATTEMPT_TIMEOUT
+                            )
+                        crawl_result = crawl_container[0] if len(crawl_container) else None
+                        domain_limiter.report(url, getattr(crawl_result, "status_code", None))
+                        result, last_error, retry = _crawl_result_to_dict(url, crawl_result)
+
+                except asyncio.TimeoutError:
+                    # A hung page will likely hang again - go straight to the fallbacks
+                    result, last_error, retry = None, f"Browser attempt timed out after {BROWSER_ATTEMPT_TIMEOUT}s", False
+                except Exception as e:
+                    result, last_error, retry = None, str(e), True
+
+            if result is not None:
+                _remember_domain_strategy(url, "crawl4ai")
+                return result
+            if not retry:
+                break
 
             # Exponential backoff before retry with jittered base delay
-            # Note: We keep the same User-Agent across retries (real browsers don't change UA mid-session)
             if attempt < MAX_RETRIES:
                 # Randomize base delay for more human-like timing
                 jittered_base = random.uniform(RETRY_DELAY_BASE * 0.5, RETRY_DELAY_BASE * 1.5)
@@ -1036,15 +1446,15 @@ def fetch_page_content(urls: list[str], max_parallel: int = 3) -> dict:
         # curl_cffi spoofs TLS fingerprints, bypassing most Cloudflare/bot detection
         # Run in thread to avoid blocking the event loop with sync HTTP
         # Use same UA/TLS profile for consistency (real browsers don't change mid-session)
-        fallback_result = await asyncio.to_thread(
-            _fetch_with_curl_cffi, url, 15, url_user_agent, url_impersonate
-        )
+        fallback_result = static_result or await _curl_fetch(url, url_user_agent, url_impersonate)
         if fallback_result.get("status") == "success":
+            _remember_domain_strategy(url, "curl_cffi")
             return fallback_result
 
         # Check if this is a soft block (bot detection page) or hard block (403/404/429)
         is_blocked = (
-            fallback_result.get("is_soft_block")
+            preferred_fetcher == "archive"
+            or fallback_result.get("is_soft_block")
             or fallback_result.get("status_code") in (403, 404, 429)
             or "403" in str(last_error)
             or "404" in str(last_error)
@@ -1056,6 +1466,7 @@ def fetch_page_content(urls: list[str], max_parallel: int = 3) -> dict:
             # Run in thread to avoid blocking the event loop with sync HTTP + sleep
             archive_result = await asyncio.to_thread(_fetch_from_archive, url)
             if archive_result.get("status") == "success":
+                _remember_domain_strategy(url, "archive")
                 return archive_result
 
         # All methods failed
@@ -1067,48 +1478,161 @@ def fetch_page_content(urls: list[str], max_parallel: int = 3) -> dict:
 
     async def _crawl_all_parallel(target_urls: List[str], max_concurrent: int) -> List[Dict[str, Any]]:
         """Process URLs in parallel with controlled concurrency."""
+        global _active_crawls, _shared_crawler_pages
+        from crawl4ai import MemoryAdaptiveDispatcher, RateLimiter
+
         semaphore = asyncio.Semaphore(max_concurrent)
-        tasks = [_crawl_single_url_with_retry(url, semaphore) for url in target_urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Convert exceptions to error dicts
-        processed_results = []
-        for url, result in zip(target_urls, results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    "url": url,
-                    "status": "failure",
-                    "error": str(result),
-                })
-            else:
-                processed_results.append(result)
+        loop = asyncio.get_running_loop()
+        batch_start = loop.time()
+        deadline = batch_start + URL_TIME_BUDGET
 
-        return processed_results
+        # Pick profile ONCE per batch - the browser pages and every fallback use it
+        profile = _get_matched_profile()
+        run_config = _build_run_config(profile[0])
 
-    # Check if we're already in an async context
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
+        # Persistent browser shared across calls; each URL gets its own page.
+        # If the browser can't start, every URL still goes through the curl_cffi/archive fallbacks.
+        crawler = await _get_shared_crawler()
+        _active_crawls += 1
+        try:
+            # URLs fetched successfully in the last CRAWL_CONTENT_TTL seconds aren't fetched again
+            cached_results = {u: r for u in target_urls if (r := _get_cached_content(u)) is not None}
+            pending_urls = [u for u in target_urls if u not in cached_results]
+
+            # First attempt for every crawlable URL in one arun_many batch; Crawl4AI's
+            # dispatcher bounds concurrency, holds back new pages while system memory is
+            # high, and spaces out requests to the same domain.
+            # Static-content domains and domains that recently only worked through a
+            # fallback skip this pass.
+            first_attempts = {}
+            browser_urls = [
+                u for u in pending_urls
+                if not _is_known_blocked_domain(u)[0] and not _get_domain_strategy(u) and not _is_static_content_domain(u)
+            ]
+            if crawler is not None and browser_urls:
+                dispatcher = MemoryAdaptiveDispatcher(
+                    memory_threshold_percent=CRAWL_MEMORY_THRESHOLD_PERCENT,
+                    recovery_threshold_percent=CRAWL_MEMORY_RECOVERY_PERCENT,
+                    memory_wait_timeout=CRAWL_MEMORY_WAIT_TIMEOUT,
+                    max_session_permit=max_concurrent,
+                    rate_limiter=RateLimiter(
+                        base_delay=(DOMAIN_MIN_DELAY, DOMAIN_MAX_DELAY),
+                        max_retries=MAX_RETRIES,
+                    ),
+                )
+                # The dispatcher yields results as they finish, not in input order - match them
+                # back by URL. Results that arrived before a timeout or memory stall are kept;
+                # URLs without one are retried individually.
+                url_by_key = {_canonical_url(u): u for u in browser_urls}
+                finished = {}
+
+                async def _collect_first_pass():
+                    stream = await crawler.arun_many(
+                        urls=browser_urls, config=run_config.clone(stream=True), dispatcher=dispatcher
+                    )
+                    async with aclosing(stream):
+                        async for crawl_result in stream:
+                            url = url_by_key.get(_canonical_url(_normalize_url(getattr(crawl_result, "url", None) or "")))
+                            if url is not None:
+                                finished[url] = crawl_result
+
+                _shared_crawler_pages += len(browser_urls)
+                try:
+                    # One hung page mustn't stall the whole batch, and unfinished URLs still need
+                    # time for their fallbacks
+                    await asyncio.wait_for(
+                        _collect_first_pass(),
+                        timeout=batch_start + URL_TIME_BUDGET * FIRST_PASS_BUDGET_SHARE - loop.time(),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                except MemoryError:
+                    # Memory stayed high past CRAWL_MEMORY_WAIT_TIMEOUT. Leave the browser to the
+                    # other batches using it and let the rest go through the per-URL path.
+                    pass
+                except Exception as e:
+                    # Batch failed as a whole - relaunch the browser only if it's actually dead,
+                    # then let every URL retry individually
+                    if _is_dead_browser_error(e):
+                        await _discard_shared_crawler(crawler)
+                        crawler = await _get_shared_crawler()
+                for url, crawl_result in finished.items():
+                    domain_limiter.report(url, getattr(crawl_result, "status_code", None))
+                    first_attempts[url] = _crawl_result_to_dict(url, crawl_result)
+
+            async def _crawl_with_budget(url: str) -> Dict[str, Any]:
+                # Bound tail latency - one stuck site shouldn't hold up the whole batch. The budget
+                # is what's left of URL_TIME_BUDGET after the first pass, not a fresh one.
+                first_attempt = first_attempts.get(url)
+                if first_attempt is not None and first_attempt[0] is not None:
+                    # Already done, however little budget the first pass left
+                    _remember_domain_strategy(url, "crawl4ai")
+                    return first_attempt[0]
+                timed_out = {"url": url, "status": "failure", "error": f"Timed out after {URL_TIME_BUDGET:g}s"}
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return timed_out
+                try:
+                    return await asyncio.wait_for(
+                        _crawl_single_url_with_retry(url, crawler, run_config, semaphore, profile, first_attempt),
+                        timeout=remaining,
+                    )
+                except asyncio.TimeoutError:
+                    return timed_out
+
+            # Retries and curl_cffi/archive fallbacks run per URL, only where needed
+            tasks = [_crawl_with_budget(url) for url in pending_urls]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Convert exceptions to error dicts; keep successes for repeat fetches
+            for url, result in zip(pending_urls, results):
+                if isinstance(result, Exception):
+                    result = {
+                        "url": url,
+                        "status": "failure",
+                        "error": str(result),
+                    }
+                elif result.get("status") == "success":
+                    _cache_content(url, result)
+                cached_results[url] = result
 
-    if loop is not None:
-        # We're inside an async context - run in a separate thread with its own loop
-        import concurrent.futures
+            processed_results = [cached_results[url] for url in target_urls]
 
-        def _run_in_thread():
-            return asyncio.run(_crawl_all_parallel(urls, max_parallel))
+            return processed_results
+        finally:
+            _active_crawls -= 1
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(_run_in_thread)
-            crawl_results = future.result()
-    else:
-        # Not in async context - can use asyncio.run directly
-        try:
-            crawl_results = asyncio.run(_crawl_all_parallel(urls, max_parallel))
-        except Exception as e:
-            return {"web_page_content": [{"url": None, "status": "failure", "error": f"Error running crawler: {str(e)}"}], "token_usage_info": get_token_budget_info()}
+    # Run on the persistent crawl loop so the warm browser always stays on a single loop
+    crawl_loop = _get_crawl_loop()
+    try:
+        if asyncio.get_running_loop() is crawl_loop:
+            crawl_results = await _crawl_all_parallel(urls, max_parallel)
+        else:
+            future = asyncio.run_coroutine_threadsafe(_crawl_all_parallel(urls, max_parallel), crawl_loop)
+            crawl_results = await asyncio.wrap_future(future)
+    except Exception as e:
+        return {"web_page_content": [{"url": None, "status": "failure", "error": f"Error running crawler: {str(e)}"}], "token_usage_info": get_token_budget_info()}
 
     return {
         "web_page_content": crawl_results,
         "token_usage_info": get_token_budget_info()
-    }
\ No newline at end of file
+    }
+
+
+def fetch_page_content(urls: list[str], max_parallel: int = 3) -> dict:
+    """
+    A tool for the agent to fetch page content from a list of URLs, and organize it in an LLM-friendly way.
+    Uses parallel fetching with retry logic and fallback mechanisms for robustness.
+
+    Args:
+        urls (list[str]): A list of URLs to fetch content from.
+        max_parallel (int): Maximum number of URLs to fetch in parallel (default: 3).
+            Note: All URLs share one Chromium instance; each parallel fetch opens a page in it.
+            Default of 3 is conservative for 16GB RAM environments (e.g., GitHub runners).
+
+    Returns:
+        A dict with 'web_page_content' (list of results) and 'token_usage_info'.
+    """
+    # Blocks the calling thread; async callers should await fetch_page_content_async instead
+    future = asyncio.run_coroutine_threadsafe(fetch_page_content_async(urls, max_parallel), _get_crawl_loop())
+    return future.result()
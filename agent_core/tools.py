@@ -1,17 +1,38 @@
-from googleapiclient.discovery import build
-from datetime import datetime, timedelta, timezone
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 import os
+import re
+import threading
 from pathlib import Path
 
 # GPT 5.2 has hard 272000 max input token limit
 MAX_INPUT_TOKENS = 240000
 
+# Max URLs verify_urls checks at once
+VERIFY_URLS_MAX_WORKERS = 16
+
 def get_date() -> str:
     """Returns the current date in YYYY-MM-DD format."""
     return datetime.now().strftime("%Y-%m-%d")
 
 
+# Token usage file written by research_runner during execution
+TOKEN_USAGE_FILE = Path(__file__).resolve().parent.parent / "research_history" / "current_token_usage.json"
+
+# Last parsed token usage: (mtime_ns, size, prompt_token_count) - skips re-parsing an unchanged file
+_token_usage_cache: tuple[int, int, int] | None = None
+
+# Prompt token count pushed in-process by the research runner (None = not running, fall back to the file)
+_live_prompt_tokens: int | None = None
+
+
+def set_live_token_usage(prompt_tokens: int | None) -> None:
+    """Record the current prompt token count for get_token_budget_info (None clears it)."""
+    global _live_prompt_tokens
+    _live_prompt_tokens = prompt_tokens
+
+
 def get_token_budget_info() -> dict:
     """
     Returns token budget information including max limit and current consumption.
@@ -20,19 +41,32 @@ def get_token_budget_info() -> dict:
     Returns:
         dict: Contains max_input_tokens, current_prompt_tokens, tokens_remaining, usage_percent, potential warning message.
     """
-    import json
-    from pathlib import Path
-
-    # Token usage file written by research_runner during execution
-    token_usage_file = Path(__file__).resolve().parent.parent / "research_history" / "current_token_usage.json"
+    global _token_usage_cache
 
     current_prompt_tokens = 0
-    if token_usage_file.exists():
+    # The runner in this process keeps the count in memory - no file I/O needed
+    live_prompt_tokens = _live_prompt_tokens
+    if live_prompt_tokens is not None:
+        st = None
+        current_prompt_tokens = live_prompt_tokens
+    else:
         try:
-            data = json.loads(token_usage_file.read_text(encoding="utf-8"))
-            current_prompt_tokens = data.get("prompt_token_count", 0)
-        except (json.JSONDecodeError, IOError):
-            pass
+            st = os.stat(TOKEN_USAGE_FILE)
+        except OSError:
+            st = None
+    if st is not None:
+        cached = _token_usage_cache
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            current_prompt_tokens = cached[2]
+        else:
+            import json
+
+            try:
+                data = json.loads(TOKEN_USAGE_FILE.read_text(encoding="utf-8"))
+                current_prompt_tokens = data.get("prompt_token_count", 0)
+                _token_usage_cache = (st.st_mtime_ns, st.st_size, current_prompt_tokens)
+            except (json.JSONDecodeError, IOError):
+                pass
 
     tokens_remaining = MAX_INPUT_TOKENS - current_prompt_tokens
     usage_percent = round((current_prompt_tokens / MAX_INPUT_TOKENS) * 100, 2) if MAX_INPUT_TOKENS > 0 else 0
@@ -47,10 +81,46 @@ def get_token_budget_info() -> dict:
         "usage_warning": warning_msg,
     }
 
+def _iter_json_array(content: str):
+    """
+    Yield the items of a top-level JSON array one at a time.
+
+    Raises:
+        json.JSONDecodeError: If content is not a well-formed JSON array.
+    """
+    import json
+    import re
+
+    decoder = json.JSONDecoder()
+    whitespace = re.compile(r"\s*")
+
+    idx = whitespace.match(content, 0).end()
+    if content[idx:idx + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", content, idx)
+    idx = whitespace.match(content, idx + 1).end()
+    if content[idx:idx + 1] == "]":
+        return
+
+    while True:
+        item, idx = decoder.raw_decode(content, idx)
+        yield item
+        idx = whitespace.match(content, idx).end()
+        delimiter = content[idx:idx + 1]
+        if delimiter == "]":
+            end = whitespace.match(content, idx + 1).end()
+            if end != len(content):
+                raise json.JSONDecodeError("Extra data", content, end)
+            return
+        if delimiter != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", content, idx)
+        idx = whitespace.match(content, idx + 1).end()
+
+
 def _extract_news_from_trace(trace_content: str) -> list | None:
     """
     Extract the 'news' array from trace JSON content.
-    Uses the same logic as extract_final_text_from_dicts in research_runner.py.
+    The final text is picked the same way run_research_agent picks it in research_runner.py:
+    the first text part of the latest event that has one.
 
     Args:
         trace_content: The raw JSON string of the trace file (a JSON array of events).
@@ -61,24 +131,22 @@ def _extract_news_from_trace(trace_content: str) -> list | None:
     import json
     import re
 
+    # Extract final text from trace events (same rule as run_research_agent).
+    # Events are decoded one at a time and only the latest text is kept, so the full
+    # event list is never materialized.
+    final_text = None
     try:
-        trace_events = json.loads(trace_content)
+        for event in _iter_json_array(trace_content):
+            if "content" in event and event["content"]:
+                c = event["content"]
+                if "parts" in c:
+                    for p in c["parts"]:
+                        if p and "text" in p and p["text"]:
+                            final_text = p["text"]
+                            break
     except json.JSONDecodeError:
         return None
 
-    # Extract final text from trace events (same logic as extract_final_text_from_dicts)
-    final_text = None
-    for event in reversed(trace_events):
-        if "content" in event and event["content"]:
-            c = event["content"]
-            if "parts" in c:
-                for p in c["parts"]:
-                    if p and "text" in p and p["text"]:
-                        final_text = p["text"]
-                        break
-                if final_text:
-                    break
-
     if not final_text:
         return None
 
@@ -108,6 +176,40 @@ def _extract_news_from_trace(trace_content: str) -> list | None:
     return None
 
 
+# Module-level Drive API client for reading previous traces (lazy init, reused across calls;
+# the credentials attached to it refresh themselves when the access token expires)
+_drive_service = None
+_drive_service_lock = threading.Lock()
+
+
+def _get_drive_service():
+    """Get or create a reusable read-side Google Drive client. Returns None if no usable token exists."""
+    global _drive_service
+    with _drive_service_lock:
+        if _drive_service is None:
+            from pathlib import Path
+            from google.oauth2.credentials import Credentials
+            from google.auth.transport.requests import Request
+            from googleapiclient.discovery import build
+
+            SCOPES = ["https://www.googleapis.com/auth/drive.file"]
+            TOKEN_PATH = Path(__file__).resolve().parent.parent / "credentials" / "drive_token.json"
+
+            if not TOKEN_PATH.exists():
+                return None
+
+            creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
+
+            if not creds or not creds.valid:
+                if creds and creds.expired and creds.refresh_token:
+                    creds.refresh(Request())
+                else:
+                    return None
+
+            _drive_service = build("drive", "v3", credentials=creds, cache_discovery=False, static_discovery=True)
+        return _drive_service
+
+
 def _get_previous_research_from_drive() -> list | None:
     """
     Attempt to fetch previous day's research news from Google Drive trace file.
@@ -116,43 +218,26 @@ def _get_previous_research_from_drive() -> list | None:
     Returns:
         list: The 'news' array from the previous day's trace, or None if not found.
     """
-    from pathlib import Path
-
     try:
-        from google.oauth2.credentials import Credentials
-        from google.auth.transport.requests import Request
-        from googleapiclient.http import MediaIoBaseDownload
-        import io
-
-        SCOPES = ["https://www.googleapis.com/auth/drive.file"]
-        TOKEN_PATH = Path(__file__).resolve().parent.parent / "credentials" / "drive_token.json"
-
         folder_id = os.getenv("GOOGLE_DRIVE_FOLDER_ID")
         if not folder_id:
             return None
 
-        if not TOKEN_PATH.exists():
+        service = _get_drive_service()
+        if service is None:
             return None
 
-        creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
-
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                return None
-
-        service = build("drive", "v3", credentials=creds)
-
         # Calculate yesterday's date in the format used by filenames (YYYYMMDD)
         yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
 
         # Search for trace files from yesterday in the target folder
-        query = f"'{folder_id}' in parents and name contains 'trace_{yesterday}' and name contains '.json' and trashed = false"
+        # Drive's `name contains` is a prefix match, so the trace_ prefix is the indexed lookup;
+        # an exact mimeType match (set by upload_to_drive) replaces a second `contains '.json'` term
+        query = f"'{folder_id}' in parents and name contains 'trace_{yesterday}' and mimeType = 'application/json' and trashed = false"
 
         results = service.files().list(
             q=query,
-            fields="files(id, name, createdTime)",
+            fields="files(id)",
             orderBy="createdTime desc",
             pageSize=1
         ).execute()
@@ -165,15 +250,8 @@ def _get_previous_research_from_drive() -> list | None:
         # Download the most recent trace file from yesterday
         file_id = files[0]["id"]
 
-        request = service.files().get_media(fileId=file_id)
-        file_content = io.BytesIO()
-        downloader = MediaIoBaseDownload(file_content, request)
-
-        done = False
-        while not done:
-            _, done = downloader.next_chunk()
-
-        content = file_content.getvalue().decode("utf-8")
+        # Single alt=media GET for the whole file - no chunked/resumable download round trips
+        content = service.files().get_media(fileId=file_id).execute().decode("utf-8")
         return _extract_news_from_trace(content)
 
     except Exception:
@@ -181,6 +259,10 @@ def _get_previous_research_from_drive() -> list | None:
         return None
 
 
+# In-process cache for get_previous_research_result: {(path, mtime_ns, size) or ("drive", day): result}
+_previous_research_cache: dict[tuple, str] = {}
+
+
 def get_previous_research_result() -> str:
     """
     Look for yesterday's research news from storage.
@@ -201,99 +283,167 @@ def get_previous_research_result() -> str:
     # Calculate yesterday's date in the format used by filenames (YYYYMMDD)
     yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
 
-    # Find trace JSON files from yesterday only
-    trace_files = [
-        f for f in os.listdir(research_dir)
-        if f.startswith(f'trace_{yesterday}') and f.endswith('.json')
-    ]
+    # Find trace JSON files from yesterday only (scandir gives the mtime without a second stat call)
+    prefix = f'trace_{yesterday}'
+    with os.scandir(research_dir) as entries:
+        trace_files = [e for e in entries if e.name.startswith(prefix) and e.name.endswith('.json')]
 
-    # If local trace files from yesterday exist, use them
+    # If local trace files from yesterday exist, use the most recent one
     if trace_files:
-        if len(trace_files) > 1:
-            # Sort by modification time to get the most recent one from yesterday
-            trace_files_with_time = [(f, os.path.getmtime(os.path.join(research_dir, f))) for f in trace_files]
-            trace_files_with_time.sort(key=lambda x: x[1], reverse=True)
-            latest_file = trace_files_with_time[0][0]
-        else:
-            latest_file = trace_files[0]
+        latest_file = max(trace_files, key=lambda e: e.stat().st_mtime)
+
+        # Reuse the previous result if the file hasn't changed since it was parsed
+        try:
+            stat = latest_file.stat()
+        except OSError as e:
+            return f"Error reading previous trace from {latest_file.name}: {str(e)}"
+        cache_key = (latest_file.path, stat.st_mtime_ns, stat.st_size)
+        cached = _previous_research_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Read the trace file and extract news
-        file_path = os.path.join(research_dir, latest_file)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(latest_file.path, 'r', encoding='utf-8') as f:
                 content = f.read()
             news = _extract_news_from_trace(content)
-            if news:
-                return json.dumps(news, indent=2)
-            return "No news found in yesterday's trace file."
+            result = json.dumps(news, indent=2) if news else "No news found in yesterday's trace file."
         except Exception as e:
-            return f"Error reading previous trace from {latest_file}: {str(e)}"
+            return f"Error reading previous trace from {latest_file.name}: {str(e)}"
+
+        # Only keep the latest entry to bound memory
+        _previous_research_cache.clear()
+        _previous_research_cache[cache_key] = result
+        return result
 
     # No local files from yesterday found - try to fetch from Google Drive
+    # (yesterday's uploaded trace doesn't change, so a found result is cached for the day)
+    cache_key = ("drive", yesterday)
+    cached = _previous_research_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     drive_news = _get_previous_research_from_drive()
     if drive_news:
-        return json.dumps(drive_news, indent=2)
+        result = json.dumps(drive_news, indent=2)
+        _previous_research_cache.clear()
+        _previous_research_cache[cache_key] = result
+        return result
 
     return "No previous research results found from yesterday. Start without previous reference."
 
 
-def verify_urls(urls: list[str]) -> list[dict]:
-    """
-    Verify that URLs are alive and accessible by performing HEAD requests.
-    Use this to validate source URLs before including them in your final output.
-    Uses curl_cffi with TLS fingerprint spoofing for robust verification that
-    matches what fetch_page_content will experience.
+# Cloudflare response headers that warrant a GET to look for a challenge page
+_CF_CHALLENGE_HEADERS = frozenset(("cf-mitigated", "cf-chl-bypass", "cf-ray"))
 
-    Args:
-        urls (list[str]): A list of URLs to verify.
 
-    Returns:
-        A list of dicts, each with 'url', 'valid' (bool), and 'status_code' or 'error'.
-    """
-    # Lazy imports to avoid circular dependency (fetch_tool imports from tools)
-    from curl_cffi import requests as curl_requests
-    from . import fetch_tool
+# Module-level worker pool + per-thread curl_cffi sessions for verify_urls (lazy init, reused across
+# calls so TLS/HTTP2 connections to the same host are kept alive; curl_cffi sessions aren't thread-safe)
+_verify_pool = None
+_verify_pool_lock = threading.Lock()
+_verify_sessions = threading.local()
 
-    results = []
 
-    for url in urls:
-        # Check for known blocked domains first
-        is_blocked, block_reason = fetch_tool._is_known_blocked_domain(url)
-        if is_blocked:
-            results.append({
-                "url": url,
-                "valid": False,
-                "error": f"known_blocked_domain: {block_reason}",
-            })
-            continue
+def _get_verify_pool() -> ThreadPoolExecutor:
+    """Get or create the worker pool used by verify_urls."""
+    global _verify_pool
+    with _verify_pool_lock:
+        if _verify_pool is None:
+            _verify_pool = ThreadPoolExecutor(max_workers=VERIFY_URLS_MAX_WORKERS, thread_name_prefix="verify_urls")
+        return _verify_pool
+
+
+def _get_verify_session():
+    """Get this worker thread's curl_cffi session."""
+    session = getattr(_verify_sessions, "session", None)
+    if session is None:
+        from curl_cffi import requests as curl_requests
+        session = _verify_sessions.session = curl_requests.Session()
+    return session
+
+
+# Validators from earlier successful verifications: {url: (etag, last_modified, status_code)}.
+# Lets repeat checks send conditional requests and accept a bodiless 304 - this matters most for
+# the GET fallbacks, which would otherwise download the page. In memory only: repeats within a run
+# and later runs of the long-lived app.py scheduler benefit, but a fresh process (GitHub Actions,
+# app.py --now) starts empty. Not persisted, since Actions checkouts start without it anyway.
+VERIFY_VALIDATORS_MAX = 1024  # Oldest entries are dropped past this
+_verify_validators: dict[str, tuple[str | None, str | None, int]] = {}
+_verify_validators_lock = threading.Lock()
+
+
+def _remember_validators(url: str, etag: str | None, last_modified: str | None, status_code: int) -> None:
+    """Store a URL's validators, dropping the oldest entry once the cache is full."""
+    with _verify_validators_lock:
+        _verify_validators.pop(url, None)
+        _verify_validators[url] = (etag, last_modified, status_code)
+        if len(_verify_validators) > VERIFY_VALIDATORS_MAX:
+            del _verify_validators[next(iter(_verify_validators))]
+
 
-        # Get matched User-Agent and TLS fingerprint profile
-        user_agent, impersonate = fetch_tool._get_matched_profile()
-
-        headers = {
-            "User-Agent": user_agent,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-User": "?1",
+def _verify_single_url(url: str) -> dict:
+    """Verify one URL for verify_urls (runs in a worker thread)."""
+    # Lazy import to avoid circular dependency (fetch_tool imports from tools)
+    from . import fetch_tool
+
+    # Check for known blocked domains first
+    is_blocked, block_reason = fetch_tool._is_known_blocked_domain(url)
+    if is_blocked:
+        return {
+            "url": url,
+            "valid": False,
+            "error": f"known_blocked_domain: {block_reason}",
         }
 
-        # Add realistic referer header
-        referer = fetch_tool._get_random_referer()
-        if referer:
-            headers["Referer"] = referer
-            headers["Sec-Fetch-Site"] = "cross-site"
-        else:
-            headers["Sec-Fetch-Site"] = "none"
+    # Get matched User-Agent and TLS fingerprint profile
+    user_agent, impersonate = fetch_tool._get_matched_profile()
+
+    headers = {
+        "User-Agent": user_agent,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "DNT": "1",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-User": "?1",
+    }
 
-        try:
-            # Use HEAD request for lightweight check
-            resp = curl_requests.head(
+    # Add realistic referer header
+    referer = fetch_tool._get_random_referer()
+    if referer:
+        headers["Referer"] = referer
+        headers["Sec-Fetch-Site"] = "cross-site"
+    else:
+        headers["Sec-Fetch-Site"] = "none"
+
+    # Conditional requests if this URL verified OK before
+    with _verify_validators_lock:
+        validators = _verify_validators.get(url)
+    if validators:
+        etag, last_modified, _ = validators
+        headers = dict(headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    session = _get_verify_session()
+    try:
+        # Use HEAD request for lightweight check
+        resp = session.head(
+            url,
+            headers=headers,
+            timeout=10,
+            allow_redirects=True,
+            impersonate=impersonate,
+        )
+
+        # Fall back to GET if HEAD not allowed
+        if resp.status_code == 405:
+            resp = session.get(
                 url,
                 headers=headers,
                 timeout=10,
@@ -301,73 +451,205 @@ def verify_urls(urls: list[str]) -> list[dict]:
                 impersonate=impersonate,
             )
 
-            # Fall back to GET if HEAD not allowed
-            if resp.status_code == 405:
-                resp = curl_requests.get(
+        # Not modified since the last successful check - same result as then
+        if resp.status_code == 304 and validators:
+            return {
+                "url": url,
+                "valid": True,
+                "status_code": validators[2],
+            }
+
+        # Check for soft-block indicators in response headers/content
+        status_code = resp.status_code
+        is_soft_blocked = False
+        if status_code == 200:
+            # For GET responses, check content for soft-block
+            if resp.request.method == "GET":
+                body = resp.text
+                if body:
+                    is_soft_blocked = fetch_tool._is_soft_block(body[:5000], status_code)
+            # For HEAD, check headers for Cloudflare challenge indicators
+            # (curl_cffi lowercases header names, so a set intersection is enough)
+            elif _CF_CHALLENGE_HEADERS & resp.headers.keys():
+                # Has CF headers, do a quick GET to check for challenge page
+                get_resp = session.get(
                     url,
                     headers=headers,
                     timeout=10,
                     allow_redirects=True,
                     impersonate=impersonate,
                 )
+                # A 304 means the page is unchanged since it last passed this check
+                if get_resp.status_code != 304:
+                    is_soft_blocked = fetch_tool._is_soft_block(get_resp.text[:5000], get_resp.status_code)
 
-            # Check for soft-block indicators in response headers/content
-            is_soft_blocked = False
-            if resp.status_code == 200:
-                # For GET responses, check content for soft-block
-                if resp.request.method == "GET" and resp.text:
-                    is_soft_blocked = fetch_tool._is_soft_block(resp.text[:5000], resp.status_code)
-                # For HEAD, check headers for Cloudflare challenge indicators
-                else:
-                    cf_headers = ["cf-mitigated", "cf-chl-bypass", "cf-ray"]
-                    if any(h in resp.headers for h in cf_headers):
-                        # Has CF headers, do a quick GET to check for challenge page
-                        get_resp = curl_requests.get(
-                            url,
-                            headers=headers,
-                            timeout=10,
-                            allow_redirects=True,
-                            impersonate=impersonate,
-                        )
-                        is_soft_blocked = fetch_tool._is_soft_block(get_resp.text[:5000], get_resp.status_code)
-
-            if is_soft_blocked:
-                results.append({
-                    "url": url,
-                    "valid": False,
-                    "status_code": resp.status_code,
-                    "error": "soft_block_detected",
-                })
-            else:
-                valid = resp.status_code < 400
-                results.append({
-                    "url": url,
-                    "valid": valid,
-                    "status_code": resp.status_code,
-                })
+        if is_soft_blocked:
+            return {
+                "url": url,
+                "valid": False,
+                "status_code": status_code,
+                "error": "soft_block_detected",
+            }
+        else:
+            if status_code < 400:
+                etag = resp.headers.get("etag")
+                last_modified = resp.headers.get("last-modified")
+                if etag or last_modified:
+                    _remember_validators(url, etag, last_modified, status_code)
+            return {
+                "url": url,
+                "valid": status_code < 400,
+                "status_code": status_code,
+            }
 
-        except Exception as e:
-            error_str = str(e).lower()
-            if "timeout" in error_str:
-                results.append({
-                    "url": url,
-                    "valid": False,
-                    "error": "timeout",
-                })
-            else:
-                results.append({
-                    "url": url,
-                    "valid": False,
-                    "error": str(e),
-                })
-
-    return results
+    except Exception as e:
+        error_str = str(e).lower()
+        if "timeout" in error_str:
+            return {
+                "url": url,
+                "valid": False,
+                "error": "timeout",
+            }
+        else:
+            return {
+                "url": url,
+                "valid": False,
+                "error": str(e),
+            }
+
+
+def _probe_liveness(url: str) -> dict:
+    """Check that a URL's host accepts a TCP (+TLS for https) connection, without any HTTP request."""
+    import socket
+    import ssl
+    from urllib.parse import urlsplit
+    from . import fetch_tool
+
+    is_blocked, block_reason = fetch_tool._is_known_blocked_domain(url)
+    if is_blocked:
+        return {
+            "url": url,
+            "valid": False,
+            "error": f"known_blocked_domain: {block_reason}",
+        }
+
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+        if not host:
+            return {"url": url, "valid": False, "error": "invalid_url"}
+        is_https = parts.scheme != "http"
+        port = parts.port or (443 if is_https else 80)
+
+        with socket.create_connection((host, port), timeout=5) as sock:
+            if is_https:
+                with ssl.create_default_context().wrap_socket(sock, server_hostname=host):
+                    pass  # Handshake happens on wrap
+        return {"url": url, "valid": True, "status_code": None}
+
+    except (socket.timeout, TimeoutError):
+        return {"url": url, "valid": False, "error": "timeout"}
+    except Exception as e:
+        return {"url": url, "valid": False, "error": str(e)}
+
+
+def verify_urls(urls: list[str], mode: str = "full") -> list[dict]:
+    """
+    Verify that URLs are alive and accessible by performing HEAD requests.
+    Use this to validate source URLs before including them in your final output.
+    Uses curl_cffi with TLS fingerprint spoofing for robust verification that
+    matches what fetch_page_content will experience.
+
+    Args:
+        urls (list[str]): A list of URLs to verify.
+        mode (str): "full" (default) checks the page itself returns a non-error status.
+            "liveness" only checks the site accepts a connection - much faster, but a dead
+            link on a live site still counts as valid. Use "full" for final output sources.
+
+    Returns:
+        A list of dicts, each with 'url', 'valid' (bool), and 'status_code' or 'error'.
+    """
+    check = _probe_liveness if mode == "liveness" else _verify_single_url
+
+    # Checks are pure network I/O - run them concurrently; map keeps input order
+    return list(_get_verify_pool().map(check, urls))
+
+
+@lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Load .env into the environment once per process (tools used to re-read it on every call)."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+# Module-level YouTube API client (lazy init, reused across youtube_search_tool calls)
+_youtube_service = None
+_youtube_service_lock = threading.Lock()
+
+
+def _get_youtube_service():
+    """Get or create a reusable YouTube Data API client. Returns None if no API key is configured."""
+    global _youtube_service
+    with _youtube_service_lock:
+        if _youtube_service is None:
+            from googleapiclient.discovery import build
+
+            _load_env()
+            api_key = os.getenv('GCP_SERVICES_API_KEY')
+            if not api_key:
+                return None
+            # Use the discovery document bundled with googleapiclient instead of fetching it over HTTP
+            _youtube_service = build('youtube', 'v3', developerKey=api_key, cache_discovery=False, static_discovery=True)
+        return _youtube_service
+
+
+# httplib2 connections aren't thread-safe, so concurrent searches (see youtube_search_tool_async)
+# each execute the shared client's requests over their own thread-local connection
+_youtube_http = threading.local()
+
+
+def _get_thread_http():
+    """Get or create the calling thread's httplib2 connection for YouTube API requests."""
+    http = getattr(_youtube_http, "http", None)
+    if http is None:
+        from googleapiclient.http import build_http
+
+        http = build_http()
+        _youtube_http.http = http
+    return http
+
+
+# Minimum gap between YouTube API requests across threads (smooths bursts when the agent runs
+# several youtube_search_tool calls in one turn)
+YOUTUBE_MIN_INTERVAL = 0.1
+_youtube_next_slot = 0.0
+_youtube_throttle_lock = threading.Lock()
+
+
+def _wait_for_youtube_slot() -> None:
+    """Reserve the next request slot and sleep until it arrives."""
+    import time
+
+    global _youtube_next_slot
+    with _youtube_throttle_lock:
+        now = time.monotonic()
+        slot = max(now, _youtube_next_slot)
+        _youtube_next_slot = slot + YOUTUBE_MIN_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
+
+
+@lru_cache(maxsize=2)
+def _default_published_after(today: date) -> str:
+    """Midnight UTC of the day before `today`, formatted for the YouTube API (memoized per day)."""
+    return (today - timedelta(days=1)).strftime("%Y-%m-%dT00:00:00Z")
 
 
 def youtube_search_tool(
         query: str,
         max_results: int = 10,
-        published_after: str = (datetime.now(timezone.utc) - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        published_after: str | None = None,
         video_duration: str = "any",
         order: str = "relevance",
         language: str = "en"
@@ -378,7 +660,7 @@ def youtube_search_tool(
     Args:
         query (str): The search query, specified by the agent.
         max_results (int): Limited to 10.
-        published_after (str): Specified by the agent, by default it is set to 1 days prior to the current date. Make sure to search newest videos. Format: YYYY-MM-DDT00:00:00Z
+        published_after (str | None): Specified by the agent, by default (None) it is set to 1 days prior to the current date. Make sure to search newest videos. Format: YYYY-MM-DDT00:00:00Z
         video_duration (str): Specified by the agent. Options: "any", "short", "medium", "long". By default it is "any".
         order (str): Specified by the agent. Options: "date", "rating", "relevance", "title", "videoCount", "viewCount". By default it is "relevance".
         language (str): Specified by the agent. The language code for the search results. By default it is "en".
@@ -389,18 +671,19 @@ def youtube_search_tool(
         'report' contains the data for each video, including title, truncated description, channel name, published date, and URL.
     """
 
+    # Computed per call (not at def time) so long-running processes don't reuse a stale date
+    if published_after is None:
+        published_after = _default_published_after(datetime.now(timezone.utc).date())
+
     try:
-        load_dotenv()
-        API_KEY = os.getenv('GCP_SERVICES_API_KEY')
+        yt = _get_youtube_service()
 
-        if not API_KEY:
+        if yt is None:
             return {
                 "status": "failure",
                 "report": "YouTube Search Failed"
             }
 
-        yt = build('youtube', 'v3', developerKey=API_KEY)
-
         search_params = {
             "part": "snippet",
             "q": query,
@@ -410,10 +693,15 @@ def youtube_search_tool(
             "publishedAfter": published_after,
             "videoDuration": video_duration,
             "relevanceLanguage": language,
+            # Partial response: only the fields read below (drops thumbnails, etags, paging info)
+            "fields": "items(id/videoId,snippet(title,description,channelTitle,publishedAt))",
         }
 
         request = yt.search().list(**search_params)
-        response = request.execute()
+        _wait_for_youtube_slot()
+        # num_retries backs off exponentially on 429/5xx and 403 rateLimitExceeded,
+        # but not on quotaExceeded (retrying can't help once the daily quota is gone)
+        response = request.execute(http=_get_thread_http(), num_retries=3)
 
         videos = []
         for item in response.get("items", []):
@@ -439,9 +727,31 @@ def youtube_search_tool(
         }
 
 
+async def youtube_search_tool_async(
+        query: str,
+        max_results: int = 10,
+        published_after: str | None = None,
+        video_duration: str = "any",
+        order: str = "relevance",
+        language: str = "en"
+    ) -> dict:
+    """
+    Awaitable version of youtube_search_tool.
+    Runs the blocking API request in a worker thread so the caller's event loop keeps running.
+    """
+    import asyncio
+
+    return await asyncio.to_thread(
+        youtube_search_tool, query, max_results, published_after, video_duration, order, language
+    )
+
+
 # Agent notes directory
 AGENT_NOTES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "agent_notes")
 
+# Note filename sanitizer: keep (unicode) alphanumerics, "-" and "_", replace the rest
+_NOTE_FILENAME_RE = re.compile(r"[^\w-]")
+
 
 def take_notes(notes: list[dict]) -> dict:
     """
@@ -482,14 +792,13 @@ def take_notes(notes: list[dict]) -> dict:
             continue
 
         # Sanitize filename: replace spaces/special chars, ensure .md extension
-        safe_title = "".join(c if c.isalnum() or c in "-_" else "_" for c in title)
-        safe_title = safe_title[:100]  # Limit filename length
+        # Limit filename length to 100 chars
+        safe_title = _NOTE_FILENAME_RE.sub("_", title[:100])
         filename = f"{safe_title}.md"
         filepath = os.path.join(AGENT_NOTES_DIR, filename)
 
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(f"# {title}\n\n{content}")
+            Path(filepath).write_text(f"# {title}\n\n{content}", encoding="utf-8")
             saved_files.append(filename)
         except Exception as e:
             errors.append(f"Failed to save '{title}': {str(e)}")
@@ -528,7 +837,8 @@ def read_notes(mode: str = "list", filenames: list[str] = None) -> dict:
     if mode == "list":
         # List all .md files in the notes directory
         try:
-            md_files = sorted([f for f in os.listdir(AGENT_NOTES_DIR) if f.endswith(".md")])
+            with os.scandir(AGENT_NOTES_DIR) as entries:
+                md_files = sorted(e.name for e in entries if e.name.endswith(".md") and e.is_file())
             return {"status": "success", "notes": md_files}
         except Exception as e:
             return {"status": "failure", "error": str(e)}
@@ -542,12 +852,12 @@ def read_notes(mode: str = "list", filenames: list[str] = None) -> dict:
 
         for filename in filenames:
             filepath = os.path.join(AGENT_NOTES_DIR, filename)
-            if not os.path.exists(filepath):
-                errors.append(f"Note '{filename}' not found")
-                continue
+            # Open directly instead of checking existence first (one syscall fewer per note)
             try:
                 with open(filepath, "r", encoding="utf-8") as f:
                     notes_content[filename] = f.read()
+            except FileNotFoundError:
+                errors.append(f"Note '{filename}' not found")
             except Exception as e:
                 errors.append(f"Failed to read '{filename}': {str(e)}")
 
@@ -578,7 +888,7 @@ def grok_x_search(objectives: str) -> dict:
         path = PROMPTS_DIR / name
         return path.read_text(encoding="utf-8")
     
-    load_dotenv()
+    _load_env()
 
     xai = OpenAI(
         api_key=os.environ["XAI_API_KEY"],
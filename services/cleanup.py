@@ -1,21 +1,68 @@
 """Cleanup service for managing research history files."""
 
+import asyncio
 import json
+import os
 import shutil
+import time
 from datetime import datetime
 from pathlib import Path
 
+from agent_core.tools import set_live_token_usage
+
 RESEARCH_HISTORY_DIR = Path(__file__).resolve().parent.parent / "research_history"
 RESEARCH_HISTORY_DIR.mkdir(exist_ok=True)
 
 AGENT_NOTES_DIR = Path(__file__).resolve().parent.parent / "agent_notes"
 
-# File for real-time token usage tracking (read by get_token_budget_info tool)
+# File for real-time token usage tracking (read by get_token_budget_info tool when it runs
+# outside the runner's process). The tool normally reads the in-memory count, so writing the
+# file on every event is opt-in.
 TOKEN_USAGE_FILE = RESEARCH_HISTORY_DIR / "current_token_usage.json"
+WRITE_TOKEN_USAGE_FILE = os.getenv("WRITE_TOKEN_USAGE_FILE", "").lower() in ("1", "true", "yes")
+# Minimum seconds between file rewrites when it is enabled; events arrive in bursts, and the
+# last update of a burst is written when the interval ends
+TOKEN_USAGE_WRITE_INTERVAL = 0.5
+_last_token_usage_write = 0.0
+_pending_token_usage: tuple[int, int] | None = None
+_token_usage_flush_scheduled = False
 
 
 def update_token_usage(prompt_tokens: int, total_tokens: int) -> None:
-    """Write current token usage to file for the agent tool to read."""
+    """Publish current token usage to the agent tool (in memory, plus the file if enabled)."""
+    global _pending_token_usage, _token_usage_flush_scheduled
+    set_live_token_usage(prompt_tokens)
+    if not WRITE_TOKEN_USAGE_FILE:
+        return
+
+    wait = _last_token_usage_write + TOKEN_USAGE_WRITE_INTERVAL - time.monotonic()
+    if wait <= 0:
+        _write_token_usage(prompt_tokens, total_tokens)
+        return
+
+    # Inside the interval: hold the latest numbers and write them once it ends
+    _pending_token_usage = (prompt_tokens, total_tokens)
+    if not _token_usage_flush_scheduled:
+        try:
+            asyncio.get_running_loop().call_later(wait, flush_token_usage)
+        except RuntimeError:
+            return  # No event loop: the next update or flush_token_usage() writes it
+        _token_usage_flush_scheduled = True
+
+
+def flush_token_usage() -> None:
+    """Write token usage held back by the write interval, if any."""
+    global _token_usage_flush_scheduled
+    _token_usage_flush_scheduled = False
+    if _pending_token_usage is not None:
+        _write_token_usage(*_pending_token_usage)
+
+
+def _write_token_usage(prompt_tokens: int, total_tokens: int) -> None:
+    """Rewrite the token usage file."""
+    global _last_token_usage_write, _pending_token_usage
+    _last_token_usage_write = time.monotonic()
+    _pending_token_usage = None
     data = {
         "prompt_token_count": prompt_tokens,
         "total_token_count": total_tokens,
@@ -25,7 +72,12 @@ def update_token_usage(prompt_tokens: int, total_tokens: int) -> None:
 
 
 def clear_token_usage() -> None:
-    """Clear token usage file at start of new run."""
+    """Clear token usage (in memory and file) at start of new run."""
+    global _last_token_usage_write, _pending_token_usage, _token_usage_flush_scheduled
+    set_live_token_usage(None)
+    _last_token_usage_write = 0.0
+    _pending_token_usage = None  # A flush still scheduled from the last run then writes nothing
+    _token_usage_flush_scheduled = False  # Its loop may be gone (asyncio.run per run), so don't wait on it
     if TOKEN_USAGE_FILE.exists():
         TOKEN_USAGE_FILE.unlink()
 
@@ -71,9 +123,17 @@ def cleanup_previous_run() -> None:
     cleanup_old_files(keep_latest=True)
 
 
+def _is_partial_write(name: str) -> bool:
+    """True for the .tmp sibling of a trace or md file whose atomic write never finished."""
+    return (name.startswith("trace_") and name.endswith(".json.tmp")) or (
+        name.startswith("research_") and name.endswith(".md.tmp")
+    )
+
+
 def cleanup_old_files(keep_latest: bool = True) -> list[Path]:
     """
     Clean up old research files, keeping only the latest ones.
+    Partial .tmp files left by runs killed mid-write are always removed.
 
     Args:
         keep_latest: If True, keeps the most recent md and trace files.
@@ -83,30 +143,28 @@ def cleanup_old_files(keep_latest: bool = True) -> list[Path]:
     """
     deleted = []
 
-    md_files = sorted(
-        RESEARCH_HISTORY_DIR.glob("research_*.md"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True
-    )
-    trace_files = sorted(
-        RESEARCH_HISTORY_DIR.glob("trace_*.json"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True
-    )
-
-    # Keep the latest, delete the rest
+    # Keep the latest, delete the rest. One directory scan; DirEntry.stat() is cached per entry
+    groups: dict[tuple[str, str], list[tuple[float, str]]] = {("research_", ".md"): [], ("trace_", ".json"): []}
     files_to_delete = []
-    if keep_latest:
-        files_to_delete.extend(md_files[1:])
-        files_to_delete.extend(trace_files[1:])
-    else:
-        files_to_delete.extend(md_files)
-        files_to_delete.extend(trace_files)
-
-    for file in files_to_delete:
+    with os.scandir(RESEARCH_HISTORY_DIR) as it:
+        for entry in it:
+            if _is_partial_write(entry.name):
+                files_to_delete.append(entry.path)  # Left by a run killed mid-write, never kept
+                continue
+            for prefix, suffix in groups:
+                if entry.name.startswith(prefix) and entry.name.endswith(suffix):
+                    groups[prefix, suffix].append((entry.stat().st_mtime, entry.path))
+                    break
+
+    for files in groups.values():
+        if keep_latest and files:
+            files.remove(max(files))
+        files_to_delete.extend(path for _, path in files)
+
+    for path in files_to_delete:
         try:
-            file.unlink()
-            deleted.append(file)
+            os.unlink(path)
+            deleted.append(Path(path))
         except OSError:
             pass
 
@@ -115,7 +173,15 @@ def cleanup_old_files(keep_latest: bool = True) -> list[Path]:
 
 def get_file_counts() -> dict[str, int]:
     """Get counts of files in research history."""
-    return {
-        "md_files": len(list(RESEARCH_HISTORY_DIR.glob("research_*.md"))),
-        "trace_files": len(list(RESEARCH_HISTORY_DIR.glob("trace_*.json"))),
-    }
+    counts = {"md_files": 0, "trace_files": 0, "tmp_files": 0}
+    # One directory scan for all patterns, matching on names only (no Path objects or stat calls)
+    with os.scandir(RESEARCH_HISTORY_DIR) as it:
+        for entry in it:
+            name = entry.name
+            if _is_partial_write(name):
+                counts["tmp_files"] += 1
+            elif name.startswith("research_") and name.endswith(".md"):
+                counts["md_files"] += 1
+            elif name.startswith("trace_") and name.endswith(".json"):
+                counts["trace_files"] += 1
+    return counts
@@ -2,8 +2,8 @@
 
 import base64
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
+from email.message import EmailMessage
 from pathlib import Path
 
 import markdown
@@ -11,14 +11,33 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.http import MediaInMemoryUpload
 
 SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
 TOKEN_PATH = Path(__file__).resolve().parent.parent / "credentials" / "gmail_token.json"
 CREDENTIALS_PATH = Path(__file__).resolve().parent.parent / "credentials" / "credentials.json"
 
+# Messages larger than this are sent as a media upload rather than inline base64
+MEDIA_UPLOAD_THRESHOLD = 1024 * 1024
+
+
+# Built once per process: the authorized http refreshes the access token on its own when it
+# expires, so only the first call touches the token file or the discovery document
+_gmail_service = None
+_gmail_service_lock = threading.Lock()
+
 
 def get_gmail_service():
-    """Get authenticated Gmail service."""
+    """Get authenticated Gmail service (cached per process)."""
+    global _gmail_service
+    with _gmail_service_lock:
+        if _gmail_service is None:
+            _gmail_service = _build_gmail_service()
+        return _gmail_service
+
+
+def _build_gmail_service():
+    """Authenticate (refreshing or running the OAuth flow if needed) and build the Gmail client."""
     creds = None
 
     if TOKEN_PATH.exists():
@@ -40,17 +59,14 @@ def get_gmail_service():
         with open(TOKEN_PATH, "w") as token:
             token.write(creds.to_json())
 
-    return build("gmail", "v1", credentials=creds)
+    return build("gmail", "v1", credentials=creds, cache_discovery=False, static_discovery=True)
 
 
-def markdown_to_html(md_content: str) -> str:
-    """Convert markdown content to styled HTML for email."""
-    html_body = markdown.markdown(
-        md_content,
-        extensions=["extra", "nl2br", "sane_lists"]
-    )
+# Converter built once; reset() clears its per-document state between conversions.
+# Only the parts of "extra" the reports use (fenced code, tables) are loaded.
+_MARKDOWN = markdown.Markdown(extensions=["fenced_code", "tables", "nl2br", "sane_lists"])
 
-    styled_html = f"""
+_HTML_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -127,11 +143,15 @@ def markdown_to_html(md_content: str) -> str:
         </style>
     </head>
     <body>
-        {html_body}
+        {body}
     </body>
     </html>
     """
-    return styled_html
+
+
+def markdown_to_html(md_content: str) -> str:
+    """Convert markdown content to styled HTML for email."""
+    return _HTML_TEMPLATE.format(body=_MARKDOWN.reset().convert(md_content))
 
 
 def send_research_email(
@@ -162,18 +182,22 @@ def send_research_email(
 
     service = get_gmail_service()
 
-    message = MIMEMultipart("alternative")
-    message["to"] = to_email
-    message["subject"] = subject
+    message = EmailMessage()
+    message["To"] = to_email
+    message["Subject"] = subject
 
-    # Attach both plain text and HTML versions
-    part1 = MIMEText(md_content, "plain")
-    part2 = MIMEText(html_content, "html")
-    message.attach(part1)
-    message.attach(part2)
+    # Plain text and HTML versions as multipart/alternative
+    message.set_content(md_content)
+    message.add_alternative(html_content, subtype="html")
 
-    raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-    body = {"raw": raw}
+    raw_bytes = bytes(message)
+    if len(raw_bytes) > MEDIA_UPLOAD_THRESHOLD:
+        # Large reports go up as an rfc822 media upload instead of a base64 string inside the JSON body
+        media = MediaInMemoryUpload(raw_bytes, mimetype="message/rfc822", resumable=True)
+        request = service.users().messages().send(userId="me", body={}, media_body=media)
+    else:
+        raw = base64.urlsafe_b64encode(raw_bytes).decode("ascii")
+        request = service.users().messages().send(userId="me", body={"raw": raw})
 
-    sent_message = service.users().messages().send(userId="me", body=body).execute()
+    sent_message = request.execute()
     return sent_message["id"]
@@ -1,6 +1,7 @@
 """Google Drive service for uploading research results."""
 
 import os
+import threading
 from pathlib import Path
 
 from google.oauth2.credentials import Credentials
@@ -14,8 +15,23 @@ TOKEN_PATH = Path(__file__).resolve().parent.parent / "credentials" / "drive_tok
 CREDENTIALS_PATH = Path(__file__).resolve().parent.parent / "credentials" / "credentials.json"
 
 
+# Built once per process: the authorized http refreshes the access token on its own when it
+# expires, so only the first call touches the token file or the discovery document
+_drive_service = None
+_drive_service_lock = threading.Lock()
+
+
 def get_drive_service():
-    """Get authenticated Google Drive service."""
+    """Get authenticated Google Drive service (cached per process)."""
+    global _drive_service
+    with _drive_service_lock:
+        if _drive_service is None:
+            _drive_service = _build_drive_service()
+        return _drive_service
+
+
+def _build_drive_service():
+    """Authenticate (refreshing or running the OAuth flow if needed) and build the Drive client."""
     creds = None
 
     if TOKEN_PATH.exists():
@@ -37,7 +53,7 @@ def get_drive_service():
         with open(TOKEN_PATH, "w") as token:
             token.write(creds.to_json())
 
-    return build("drive", "v3", credentials=creds)
+    return build("drive", "v3", credentials=creds, cache_discovery=False, static_discovery=True)
 
 
 MIME_TYPES = {
@@ -45,6 +61,8 @@ MIME_TYPES = {
     ".json": "application/json",
 }
 
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024  # must be a multiple of 256 KiB
+
 
 def upload_to_drive(file_path: Path, folder_id: str | None = None) -> str:
     """
@@ -69,12 +87,17 @@ def upload_to_drive(file_path: Path, folder_id: str | None = None) -> str:
     }
 
     mimetype = MIME_TYPES.get(file_path.suffix, "application/octet-stream")
-    media = MediaFileUpload(str(file_path), mimetype=mimetype)
+    # Resumable upload streams the file from disk in chunks; a transient error only resends
+    # the current chunk (next_chunk retries 429/5xx with exponential backoff)
+    media = MediaFileUpload(str(file_path), mimetype=mimetype, resumable=True, chunksize=UPLOAD_CHUNK_SIZE)
 
-    file = service.files().create(
+    request = service.files().create(
         body=file_metadata,
         media_body=media,
         fields="id"
-    ).execute()
+    )
+    file = None
+    while file is None:
+        _, file = request.next_chunk(num_retries=3)
 
     return file.get("id")
\ No newline at end of file
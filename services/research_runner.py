@@ -1,8 +1,10 @@
 """Research agent runner service."""
 
 import json
+import os
 import re
 import uuid
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
@@ -22,6 +24,22 @@ from .cleanup import (
 
 APP_NAME = "ai_news_research"
 
+# The full event trace is uploaded to Drive and read back by get_previous_research_result the
+# next day, so it is on by default; WRITE_TRACE_FILE=0 skips all trace serialization and I/O
+WRITE_TRACE_FILE = os.getenv("WRITE_TRACE_FILE", "1").lower() in ("1", "true", "yes")
+
+# Tool name -> run stats counter it increments
+TOOL_CALL_STATS = {
+    "google_search_agent": "search_agent_calls",
+    "grok_x_search": "x_search_calls",
+    "fetch_page_content": "fetch_calls",
+    "youtube_search_tool": "youtube_search_calls",
+    "youtube_viewer_agent": "youtube_viewer_calls",
+    "verify_urls": "verify_urls_calls",
+}
+
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
 
 def event_to_dict(event):
     """Convert ADK Event to serializable dict."""
@@ -38,23 +56,34 @@ class TraceWriter:
     """
     Incrementally writes trace events to a JSON file to minimize memory usage.
     Writes events as they arrive instead of accumulating in memory.
+    The trace is written to a .tmp sibling and only renamed into place on a clean exit.
     """
 
     def __init__(self, trace_file: Path):
         self.trace_file = trace_file
         self.event_count = 0
         self._file = None
+        self._tmp_file = trace_file.with_name(trace_file.name + ".tmp")
 
     def __enter__(self):
-        self._file = self.trace_file.open("w", encoding="utf-8")
+        # Large buffer and no per-event flush: a failed run deletes its partial trace anyway,
+        # so small events are coalesced into big writes
+        self._file = self._tmp_file.open("w", encoding="utf-8", buffering=1 << 20)
         self._file.write("[\n")  # Start JSON array
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self._file:
             self._file.write("\n]")  # Close JSON array
+            if exc_type is None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
             self._file.close()
             self._file = None
+            if exc_type is None:
+                os.replace(self._tmp_file, self.trace_file)
+            else:
+                self._tmp_file.unlink(missing_ok=True)
 
     def write_event(self, event) -> dict:
         """
@@ -67,28 +96,28 @@ class TraceWriter:
             if self.event_count > 0:
                 self._file.write(",\n")
 
-            # Write with indent for readability, using default=str for non-serializable types
-            json_str = json.dumps(event_dict, indent=2, default=str)
-            # Indent each line for proper array formatting
-            indented = "\n".join("  " + line for line in json_str.split("\n"))
-            self._file.write(indented)
-            self._file.flush()  # Ensure data is written to disk
+            # One compact event per line: still a plain JSON array, but no pretty-printer pass
+            # or re-indenting; default=str covers non-serializable types
+            self._file.write(json.dumps(event_dict, separators=(",", ":"), default=str))
 
             self.event_count += 1
 
         return event_dict
 
 
-def extract_final_text_from_dicts(trace_dicts: list) -> str:
-    """Extract final output text from trace event dicts."""
-    for event in reversed(trace_dicts):
-        if "content" in event and event["content"]:
-            c = event["content"]
-            if "parts" in c:
-                for p in c["parts"]:
-                    if p and "text" in p and p["text"]:
-                        return p["text"]
-    return "No final text found in trace."
+class NullTraceWriter:
+    """Stand-in for TraceWriter when trace writing is disabled: converts events, writes nothing."""
+
+    event_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def write_event(self, event) -> dict:
+        return event_to_dict(event)
 
 
 def format_run_stats_md(stats: dict, run_duration_seconds: float) -> str:
@@ -113,25 +142,61 @@ def format_run_stats_md(stats: dict, run_duration_seconds: float) -> str:
     return "\n".join(lines)
 
 
+def _iter_json_objects(text: str):
+    """
+    Yield each balanced top-level {...} span in text in one linear pass.
+    Braces inside JSON string literals are ignored; an unbalanced '{' is skipped.
+    """
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = False
+        escaped = False
+        end = -1
+        for i in range(start, len(text)):
+            c = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif c == "\\":
+                    escaped = True
+                elif c == '"':
+                    in_string = False
+            elif c == '"':
+                in_string = True
+            elif c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if depth == 0:
+                    end = i + 1
+                    break
+        if end == -1:
+            start = text.find("{", start + 1)
+            continue
+        yield text[start:end]
+        start = text.find("{", end)
+
+
 def extract_json_from_text(text: str) -> dict | None:
     """Extract JSON object from text that may contain markdown code blocks."""
-    # Try to find JSON in code blocks first
-    json_block_pattern = r"```(?:json)?\s*(\{[\s\S]*?\})\s*```"
-    match = re.search(json_block_pattern, text)
+    # Try to find JSON in code blocks first (the regex only runs if a fence is present at all)
+    match = _JSON_BLOCK_RE.search(text) if "```" in text else None
     if match:
         try:
             return json.loads(match.group(1))
         except json.JSONDecodeError:
             pass
 
-    # Try to find raw JSON object
-    json_pattern = r"\{[\s\S]*\"news\"[\s\S]*\}"
-    match = re.search(json_pattern, text)
-    if match:
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError:
-            pass
+    # Try to find raw JSON object; skip the scan entirely when no "news" key can be present
+    if '"news"' not in text:
+        return None
+    for candidate in _iter_json_objects(text):
+        if '"news"' in candidate:
+            try:
+                return json.loads(candidate)
+            except json.JSONDecodeError:
+                pass
 
     return None
 
@@ -144,66 +209,66 @@ def format_research_to_md(data: dict, timestamp: str, stats_md: str = "") -> str
         f"**Generated:** {timestamp}",
         "",
     ]
+    append = lines.append
 
     # Insert run stats right after the header if provided
     if stats_md:
-        lines.append(stats_md)
+        append(stats_md)
 
     if data.get("comments"):
-        lines.extend([
-            "## Research Notes",
-            "",
-            data["comments"],
-            "",
-        ])
+        append("## Research Notes")
+        append("")
+        append(data["comments"])
+        append("")
 
     news_items = data.get("news", [])
-    lines.extend([
-        f"## News Items ({len(news_items)} found)",
-        "",
-    ])
+    append(f"## News Items ({len(news_items)} found)")
+    append("")
 
     if not news_items:
-        lines.append("*No news items found.*")
+        append("*No news items found.*")
     else:
+        # One pre-joined block per item section; the final join supplies the separating newlines
         for i, item in enumerate(news_items, 1):
-            title = item.get("title", "Untitled")
-            body = item.get("body", "No content.")
-            sources = item.get("sources", [])
-
-            lines.extend([
-                f"### {i}. {title}",
-                "",
-                body,
-                "",
-            ])
+            append(f"### {i}. {item.get('title', 'Untitled')}\n\n{item.get('body', 'No content.')}\n")
 
+            sources = item.get("sources", [])
             if sources:
-                lines.append("**Sources:**")
-                for source in sources:
-                    lines.append(f"- {source}")
-                lines.append("")
+                append("**Sources:**\n" + "\n".join(f"- {source}" for source in sources) + "\n")
 
-            lines.append("---")
-            lines.append("")
+            append("---\n")
 
     return "\n".join(lines)
 
 
+def _write_text_atomic(path: Path, content: str) -> None:
+    """Write to a .tmp sibling, fsync, then rename over path so it is never seen half-written."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def write_results_to_md(text: str, output_path: Path, timestamp: str, stats_md: str = "") -> None:
     """Write extracted text to markdown file, parsing JSON if possible."""
     parsed = extract_json_from_text(text)
 
     if parsed and "news" in parsed:
         formatted = format_research_to_md(parsed, timestamp, stats_md)
-        output_path.write_text(formatted, encoding="utf-8")
+        _write_text_atomic(output_path, formatted)
     else:
         # Fallback: include stats even if JSON parsing fails
         header = f"# Research Agent Run\n\n**Generated:** {timestamp}\n\n"
         if stats_md:
             header += stats_md + "\n"
         content = header + text
-        output_path.write_text(content, encoding="utf-8")
+        _write_text_atomic(output_path, content)
 
 
 async def run_research_agent() -> tuple[Path, Path]:
@@ -211,16 +276,18 @@ async def run_research_agent() -> tuple[Path, Path]:
     Run the research agent and save results.
 
     Returns:
-        Tuple of (md_file_path, trace_file_path)
+        Tuple of (md_file_path, trace_file_path). The trace file is not created
+        when WRITE_TRACE_FILE is disabled.
 
     Raises:
         Exception: Re-raises any exception after cleaning up partial outputs.
     """
     import time
 
-    start_time = time.time()
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    timestamp_readable = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    start_time = time.monotonic()
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    timestamp_readable = now.strftime("%Y-%m-%d %H:%M:%S")
 
     # File paths for this run (tracked for cleanup on failure)
     trace_file = RESEARCH_HISTORY_DIR / f"trace_{timestamp}.json"
@@ -253,10 +320,10 @@ async def run_research_agent() -> tuple[Path, Path]:
         parts=[types.Part(text="Research the latest AI development news from the past 24 hours as instructed.")],
     )
 
-    # Keep only recent event dicts for final text extraction and stats
-    # (we only need the last few events for final text, and accumulate stats incrementally)
-    recent_events: list[dict] = []
+    # Keep only the text of recent events for final text extraction (the full event dicts are
+    # already on disk in the trace); stats are accumulated incrementally
     max_recent_events = 20  # Keep last N events for final text extraction
+    recent_texts: deque[str | None] = deque(maxlen=max_recent_events)
 
     # Accumulate stats incrementally instead of re-processing all events
     stats = {
@@ -273,7 +340,7 @@ async def run_research_agent() -> tuple[Path, Path]:
 
     try:
         # Stream events to disk incrementally to minimize memory usage
-        with TraceWriter(trace_file) as trace_writer:
+        with (TraceWriter(trace_file) if WRITE_TRACE_FILE else NullTraceWriter()) as trace_writer:
             async for event in runner.run_async(
                 user_id=user_id,
                 session_id=session_id,
@@ -282,30 +349,21 @@ async def run_research_agent() -> tuple[Path, Path]:
                 # Write event to disk immediately and get dict representation
                 event_dict = trace_writer.write_event(event)
 
-                # Keep recent events for final text extraction (sliding window)
-                recent_events.append(event_dict)
-                if len(recent_events) > max_recent_events:
-                    recent_events.pop(0)
-
-                # Update stats incrementally from this event
-                content = event_dict.get("content", {})
-                parts = content.get("parts", []) if content else []
-                for part in parts:
-                    if part and part.get("function_call"):
-                        func_name = part["function_call"].get("name", "")
+                # Update stats incrementally from this event, noting its first text part
+                event_text = None
+                content = event_dict.get("content") or {}
+                for part in content.get("parts") or ():
+                    if not part:
+                        continue
+                    if event_text is None and part.get("text"):
+                        event_text = part["text"]
+                    function_call = part.get("function_call")
+                    if function_call:
                         stats["total_tool_calls"] += 1
-                        if func_name == "google_search_agent":
-                            stats["search_agent_calls"] += 1
-                        elif func_name == "grok_x_search":
-                            stats["x_search_calls"] += 1
-                        elif func_name == "fetch_page_content":
-                            stats["fetch_calls"] += 1
-                        elif func_name == "youtube_search_tool":
-                            stats["youtube_search_calls"] += 1
-                        elif func_name == "youtube_viewer_agent":
-                            stats["youtube_viewer_calls"] += 1
-                        elif func_name == "verify_urls":
-                            stats["verify_urls_calls"] += 1
+                        stat_key = TOOL_CALL_STATS.get(function_call.get("name", ""))
+                        if stat_key:
+                            stats[stat_key] += 1
+                recent_texts.append(event_text)
 
                 # Track token usage (last event with usage wins)
                 usage = event_dict.get("usage_metadata")
@@ -319,13 +377,13 @@ async def run_research_agent() -> tuple[Path, Path]:
                         stats["final_total_tokens"] = total_tokens
 
         # Calculate run duration
-        run_duration = time.time() - start_time
+        run_duration = time.monotonic() - start_time
 
         # Format stats for markdown
         stats_md = format_run_stats_md(stats, run_duration)
 
         # Extract final text from recent events (memory-efficient)
-        final_text = extract_final_text_from_dicts(recent_events)
+        final_text = next((text for text in reversed(recent_texts) if text), "No final text found in trace.")
         write_results_to_md(final_text, md_file, timestamp_readable, stats_md)
 
         # Success: clean up previous run's files (keep only current run's results)
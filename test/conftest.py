@@ -1,6 +1,9 @@
 """
-Pytest configuration for fetch_tool tests.
+Pytest configuration and shared fixtures.
 """
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 
 
@@ -9,3 +12,58 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "integration: marks tests as integration tests (may require network access)"
     )
+
+
+class _CannedHandler(BaseHTTPRequestHandler):
+    """Serves server.routes[path] = (status, headers, body) and records every request."""
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, send_body: bool):
+        self.server.requests.append((self.command, self.path, dict(self.headers)))
+        status, headers, body = self.server.routes.get(self.path, (404, {"Content-Type": "text/html"}, b"<html>Not found</html>"))
+        if self.command == "HEAD" and self.path in self.server.no_head:
+            status, headers, body = 405, {}, b""
+        etag = headers.get("ETag")
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # Client aborted the transfer
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+
+@pytest.fixture
+def http_server():
+    """
+    Local HTTP server for tests that need real responses without network access.
+    Set server.routes[path] = (status, headers, body); paths in server.no_head answer HEAD
+    with 405. server.url(path) builds a URL and server.requests records (method, path, headers).
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CannedHandler)
+    server.daemon_threads = True
+    server.routes = {}
+    server.no_head = set()
+    server.requests = []
+    server.url = lambda path: f"http://127.0.0.1:{server.server_address[1]}{path}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
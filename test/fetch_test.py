@@ -23,9 +23,11 @@ from unittest.mock import patch, MagicMock, AsyncMock
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from agent_core import fetch_tool
 from agent_core.fetch_tool import (
     # Helper functions
     _normalize_url,
+    _canonical_url,
     _truncate_content,
     _is_soft_block,
     _get_matched_profile,
@@ -37,6 +39,7 @@ from agent_core.fetch_tool import (
     _fetch_with_curl_cffi,
     _fetch_from_archive,
     fetch_page_content,
+    fetch_page_content_async,
     _get_domain_delays,
     _is_known_blocked_domain,
     _get_curl_session,
@@ -98,6 +101,45 @@ class TestNormalizeUrl:
         assert _normalize_url(url) == url
 
 
+class TestCanonicalUrl:
+    """Tests for the _canonical_url function."""
+
+    def test_tracking_params_removed(self):
+        """utm_* and click-id params should be dropped, other params kept."""
+        url = "https://example.com/post?id=7&utm_source=x&utm_medium=y&fbclid=abc"
+        assert _canonical_url(url) == "https://example.com/post?id=7"
+
+    def test_fragment_and_host_case_normalized(self):
+        """Fragments should be dropped and the host lowercased."""
+        assert _canonical_url("https://Example.COM/Page#top") == "https://example.com/Page"
+
+    def test_github_ref_param_kept(self):
+        """GitHub's ref= selects a branch and must survive."""
+        url = "https://github.com/org/repo/blob/main/README.md?ref=dev"
+        assert _canonical_url(url) == url
+
+    def test_valueless_param_kept_verbatim(self):
+        """A bare ?flag should not become ?flag=."""
+        assert _canonical_url("https://example.com/p?flag") == "https://example.com/p?flag"
+        assert _canonical_url("https://example.com/p?flag&utm_source=x") == "https://example.com/p?flag"
+
+    def test_reserved_characters_in_values_not_encoded(self):
+        """Semicolons and slashes inside values should be left as written."""
+        url = "https://example.com/p?a=x;y&b=/c/d"
+        assert _canonical_url(url) == url
+        assert _canonical_url(url + "&utm_medium=z") == url
+
+    def test_userinfo_case_preserved(self):
+        """Only the host is lowercased, not the credentials in front of it."""
+        assert _canonical_url("https://User:Pw@Example.COM/p") == "https://User:Pw@example.com/p"
+
+    def test_spa_route_fragment_kept(self):
+        """#/route and #!route fragments select content in single-page apps."""
+        assert _canonical_url("https://example.com/app#/news/1") == "https://example.com/app#/news/1"
+        assert _canonical_url("https://example.com/app#!news/1") == "https://example.com/app#!news/1"
+        assert _canonical_url("https://example.com/app#/news/1") != _canonical_url("https://example.com/app#/news/2")
+
+
 class TestTruncateContent:
     """Tests for the _truncate_content function."""
 
@@ -312,11 +354,75 @@ class TestDomainRateLimiter:
         
         asyncio.run(_test())
 
+    def test_throttling_backs_off_and_success_recovers(self):
+        """429/502/503 double a domain's delay multiplier up to the cap; successes walk it back to 1."""
+        limiter = DomainRateLimiter()
+        url = "https://example.com/a"
+
+        for expected in (2.0, 4.0, 8.0, 8.0):
+            limiter.report(url, 429)
+            assert limiter._backoff["example.com"] == expected
+
+        limiter.report(url, 404)  # Errors that aren't throttling leave it alone
+        limiter.report(url, None)
+        assert limiter._backoff["example.com"] == 8.0
+
+        for _ in range(20):
+            limiter.report(url, 200)
+        assert limiter._backoff["example.com"] == 1.0
+        assert limiter._backoff["other.com"] == 1.0  # Other domains never affected
+
+    def test_backoff_stretches_spacing(self):
+        """The multiplier scales the wait between requests to the throttled domain."""
+        async def _test():
+            limiter = DomainRateLimiter()
+            url = "https://example.com/a"
+            limiter.report(url, 503)
+            limiter.report(url, 503)  # 4x
+
+            waits = []
+            for _ in range(2):
+                start = time.monotonic()
+                async with limiter.limit(url):
+                    waits.append(time.monotonic() - start)
+            return waits
+
+        with patch('agent_core.fetch_tool._get_domain_delays', return_value=(0.05, 0.05)):
+            waits = asyncio.run(_test())
+
+        assert waits[0] < 0.05
+        assert 0.15 < waits[1] < 0.5
+
 
 # =============================================================================
 # UNIT TESTS - Archive Cache Functions
 # =============================================================================
 
+class TestContentCache:
+    """Tests for the in-process cache of successful fetches."""
+
+    def test_variants_share_an_entry(self):
+        """A cached page should be found again under a tracking-param variant."""
+        with patch.dict(fetch_tool._content_cache, clear=True):
+            fetch_tool._cache_content("https://example.com/a?utm_source=x", {"status": "success"})
+            assert fetch_tool._get_cached_content("https://EXAMPLE.com/a") == {"status": "success"}
+
+    def test_expired_entries_purged_on_insert(self):
+        """Inserting should drop entries that already expired, even if never looked up again."""
+        with patch.dict(fetch_tool._content_cache, clear=True):
+            fetch_tool._content_cache["https://old.example.com/"] = (time.time() - 1, {})
+            fetch_tool._cache_content("https://example.com/new", {"status": "success"})
+            assert list(fetch_tool._content_cache) == ["https://example.com/new"]
+
+    def test_size_capped(self):
+        """The oldest entries should go once the cache is full."""
+        with patch.dict(fetch_tool._content_cache, clear=True), \
+                patch.object(fetch_tool, "CRAWL_CONTENT_CACHE_MAX", 2):
+            for i in range(3):
+                fetch_tool._cache_content(f"https://example.com/{i}", {"status": "success"})
+            assert list(fetch_tool._content_cache) == ["https://example.com/1", "https://example.com/2"]
+
+
 class TestArchiveCache:
     """Tests for archive cache functions."""
 
@@ -419,6 +525,72 @@ class TestFetchWithCurlCffi:
         assert "Non-HTML" in result.get("error", "")
 
 
+class TestFetchWithCurlCffiLocal:
+    """_fetch_with_curl_cffi against a local server (no network needed)."""
+
+    def test_large_body_capped(self, http_server):
+        """Pages past CURL_MAX_BODY_BYTES are cut off and extracted from what was read."""
+        body = b"<html><head><title>Big</title></head><body>" + b"<p>paragraph</p>" * 20000 + b"</body></html>"
+        http_server.routes["/big"] = (200, {"Content-Type": "text/html"}, body)
+        with patch.object(fetch_tool, "CURL_MAX_BODY_BYTES", 64 * 1024):
+            result = _fetch_with_curl_cffi(http_server.url("/big"), timeout=10)
+
+        assert result["status"] == "success"
+        assert result["title"] == "Big"
+        assert 0 < result["content"].count("paragraph") < 64 * 1024 // len("<p>paragraph</p>") + 1
+
+    def test_non_html_rejected(self, http_server):
+        """Non-HTML responses are aborted on the first chunk and fail on their real Content-Type."""
+        http_server.routes["/data"] = (200, {"Content-Type": "application/json"}, b'{"a": 1}' * 50000)
+        result = _fetch_with_curl_cffi(http_server.url("/data"), timeout=10)
+
+        assert result["status"] == "failure"
+        assert result["error"] == "Non-HTML content type: application/json"
+
+    def test_error_status_reported(self, http_server):
+        """Aborted error pages keep their real status code."""
+        http_server.routes["/missing"] = (404, {"Content-Type": "text/html"}, b"<p>gone</p>" * 50000)
+        result = _fetch_with_curl_cffi(http_server.url("/missing"), timeout=10)
+
+        assert result["status"] == "failure"
+        assert result["status_code"] == 404
+        assert result["error"] == "HTTP 404"
+
+    def test_error_status_checked_before_content_type(self, http_server):
+        """A non-HTML error response is reported by its status, not its Content-Type."""
+        http_server.routes["/api"] = (503, {"Content-Type": "application/json"}, b'{"error": "busy"}')
+        result = _fetch_with_curl_cffi(http_server.url("/api"), timeout=10)
+
+        assert result["status_code"] == 503
+        assert result["error"] == "HTTP 503"
+
+    def test_meta_charset_used_without_header_charset(self, http_server):
+        """A <meta charset> decides the decoding when Content-Type has no charset."""
+        html = '<html><head><meta charset="iso-8859-1"><title>Café</title></head><body><p>naïve café</p></body></html>'
+        http_server.routes["/latin1"] = (200, {"Content-Type": "text/html"}, html.encode("iso-8859-1"))
+        result = _fetch_with_curl_cffi(http_server.url("/latin1"), timeout=10)
+
+        assert result["title"] == "Café"
+        assert "naïve café" in result["content"]
+
+    def test_header_charset_wins(self, http_server):
+        """The Content-Type charset takes precedence over the page's own declaration."""
+        html = '<html><head><meta charset="iso-8859-1"><title>x</title></head><body><p>日本語 café</p></body></html>'
+        http_server.routes["/utf8"] = (200, {"Content-Type": "text/html; charset=utf-8"}, html.encode("utf-8"))
+        result = _fetch_with_curl_cffi(http_server.url("/utf8"), timeout=10)
+
+        assert "日本語 café" in result["content"]
+
+    def test_unknown_charset_falls_back_to_utf8(self, http_server):
+        """An unknown charset name shouldn't fail the fetch."""
+        html = '<html><head><meta charset="no-such-charset"><title>x</title></head><body><p>café</p></body></html>'
+        http_server.routes["/bogus"] = (200, {"Content-Type": "text/html"}, html.encode("utf-8"))
+        result = _fetch_with_curl_cffi(http_server.url("/bogus"), timeout=10)
+
+        assert result["status"] == "success"
+        assert "café" in result["content"]
+
+
 @pytest.mark.integration
 class TestFetchFromArchive:
     """Integration tests for _fetch_from_archive function."""
@@ -521,6 +693,13 @@ class TestFetchPageContentMocked:
         assert result["status"] == "success"
         assert result["fetcher"] == "curl_cffi"
 
+    def test_async_entry_point_empty_list(self):
+        """fetch_page_content_async should be awaitable from a running event loop."""
+        result = asyncio.run(fetch_page_content_async([]))
+
+        assert result["web_page_content"] == []
+        assert "token_usage_info" in result
+
     def test_soft_block_detection_in_response(self):
         """Soft blocks should be properly detected in responses."""
         # Simulate a Cloudflare block page
@@ -538,6 +717,146 @@ class TestFetchPageContentMocked:
         assert _is_soft_block(block_content, 200) is True
 
 
+class FakeCrawlResult:
+    """Minimal stand-in for a successful Crawl4AI CrawlResult."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.success = True
+        self.status_code = 200
+        self.markdown = MagicMock(fit_markdown=f"Article body for {url}. " * 40, raw_markdown=None)
+        self.metadata = {"title": url}
+        self.redirected_url = None
+        self.error_message = None
+
+
+class FakeCrawler:
+    """Shared-crawler stand-in whose arun_many returns results in completion order."""
+
+    def __init__(self, order=None, hang=()):
+        self.order = order  # Indices into the submitted URLs, in the order they "finish"
+        self.hang = hang  # URLs whose page never finishes loading
+        self.submitted = []
+
+    async def arun_many(self, urls, config, dispatcher):
+        self.submitted.extend(urls)
+        order = self.order or range(len(urls))
+
+        async def _stream():
+            for i in order:
+                if urls[i] in self.hang:
+                    await asyncio.sleep(3600)
+                yield FakeCrawlResult(urls[i])
+
+        return _stream()
+
+    async def arun(self, url, config):
+        return [FakeCrawlResult(url)]
+
+
+class FailingCrawler(FakeCrawler):
+    """Shared-crawler stand-in whose arun_many pass fails as a whole; per-URL crawls still work."""
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    async def arun_many(self, urls, config, dispatcher):
+        raise self.error
+
+
+class TestFetchPageContentBatch:
+    """Tests for the batched browser pass, with the shared browser mocked out."""
+
+    def _fetch(self, urls, crawler):
+        with patch('agent_core.fetch_tool._get_shared_crawler', AsyncMock(return_value=crawler)), \
+                patch.dict('agent_core.fetch_tool._content_cache', clear=True), \
+                patch.dict('agent_core.fetch_tool._domain_strategy_cache', clear=True):
+            return asyncio.run(fetch_page_content_async(urls, max_parallel=3))["web_page_content"]
+
+    def test_original_url_fetched_and_tracking_variants_deduped(self):
+        """The canonical form is only a dedupe key - the URL as given is what gets crawled."""
+        crawler = FakeCrawler()
+        urls = [
+            "https://Example.com/app?flag&utm_source=x#/news/1",
+            "https://example.com/app?flag#/news/1",
+            "https://example.com/app?flag#/news/2",
+        ]
+        pages = self._fetch(urls, crawler)
+
+        assert crawler.submitted == [urls[0], urls[2]]
+        assert [p["url"] for p in pages] == [urls[0], urls[2]]
+        assert all(p["status"] == "success" for p in pages)
+
+    def test_memory_timeout_keeps_shared_browser(self):
+        """A dispatcher MemoryError falls through to per-URL crawls without discarding the browser."""
+        crawler = FailingCrawler(MemoryError("Memory usage exceeded threshold for 30 seconds"))
+        with patch('agent_core.fetch_tool._discard_shared_crawler', AsyncMock()) as discard:
+            pages = self._fetch(["https://example.com/a"], crawler)
+
+        discard.assert_not_called()
+        assert pages[0]["status"] == "success"
+
+    def test_dead_browser_discarded(self):
+        """Only an error saying the browser is gone should relaunch it."""
+        crawler = FailingCrawler(RuntimeError("Target page, context or browser has been closed"))
+        with patch('agent_core.fetch_tool._discard_shared_crawler', AsyncMock()) as discard:
+            self._fetch(["https://example.com/a"], crawler)
+
+        discard.assert_awaited_once_with(crawler)
+
+    def test_hung_page_doesnt_stall_batch(self):
+        """Results in before the batch budget are kept; the hung URL moves to the per-URL path."""
+        urls = ["https://a.example.com/", "https://b.example.com/"]
+        crawler = FakeCrawler(order=[0, 1], hang=(urls[1],))
+        with patch('agent_core.fetch_tool.URL_TIME_BUDGET', 0.5), \
+                patch.object(crawler, "arun", wraps=crawler.arun) as arun:
+            start = time.monotonic()
+            pages = self._fetch(urls, crawler)
+
+        assert time.monotonic() - start < 5
+        assert [p["status"] for p in pages] == ["success", "success"]
+        assert [call.kwargs["url"] for call in arun.call_args_list] == [urls[1]]
+
+    def test_batch_bounded_by_url_budget(self):
+        """A URL hung in the first pass only gets what's left of its budget, not a fresh one."""
+        url = "https://a.example.com/"
+        crawler = FakeCrawler(hang=(url,))
+
+        async def _hang(url, config):
+            await asyncio.sleep(3600)
+
+        with patch('agent_core.fetch_tool.URL_TIME_BUDGET', 1.0), \
+                patch.object(crawler, "arun", side_effect=_hang):
+            start = time.monotonic()
+            pages = self._fetch([url], crawler)
+
+        assert time.monotonic() - start < 1.5
+        assert pages[0]["status"] == "failure"
+        assert "Timed out" in pages[0]["error"]
+
+    def test_per_url_crawls_count_toward_recycling(self):
+        """Pages opened by per-URL crawls count toward BROWSER_MAX_PAGES, not just the first pass."""
+        urls = ["https://a.example.com/", "https://b.example.com/"]
+        crawler = FakeCrawler(order=[0, 1], hang=(urls[1],))
+        with patch('agent_core.fetch_tool.URL_TIME_BUDGET', 0.5), \
+                patch.object(fetch_tool, "_shared_crawler_pages", 0):
+            self._fetch(urls, crawler)
+            assert fetch_tool._shared_crawler_pages == 3
+
+    def test_out_of_order_results_matched_by_url(self):
+        """arun_many returns results in completion order; each page must stay with its own URL."""
+        urls = ["https://a.example.com/", "https://b.example.com/", "https://c.example.com/"]
+        crawler = FakeCrawler(order=[1, 2, 0])
+        with patch.object(DomainRateLimiter, "report") as report:
+            pages = self._fetch(urls, crawler)
+
+        assert [p["url"] for p in pages] == urls
+        assert [p["title"] for p in pages] == urls
+        assert all(f"Article body for {p['url']}" in p["content"] for p in pages)
+        assert sorted(call.args[0] for call in report.call_args_list) == urls
+
+
 class TestContentTruncation:
     """Tests for content truncation behavior in fetch results."""
 
@@ -0,0 +1,65 @@
+"""
+Tests for services/research_runner.py
+
+Covers pulling the news JSON out of the agent's final text.
+
+Run: pytest test/research_runner_test.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.research_runner import _iter_json_objects, extract_json_from_text
+
+
+class TestIterJsonObjects:
+    """Tests for the brace-depth scanner."""
+
+    def test_top_level_objects_found(self):
+        """Each balanced top-level object is yielded once, nested ones as part of it."""
+        text = 'before {"a": {"b": 1}} between {"c": 2} after'
+        assert list(_iter_json_objects(text)) == ['{"a": {"b": 1}}', '{"c": 2}']
+
+    def test_braces_in_strings_ignored(self):
+        """Braces and escaped quotes inside strings don't change the depth."""
+        text = 'x {"t": "a } b { \\" }", "u": "\\\\"} y'
+        assert list(_iter_json_objects(text)) == ['{"t": "a } b { \\" }", "u": "\\\\"}']
+
+    def test_truncated_object_skipped(self):
+        """An object that never closes isn't yielded, but later complete ones still are."""
+        assert list(_iter_json_objects('{"a": {"b": 1}')) == ['{"b": 1}']
+        assert list(_iter_json_objects('{"a": "unterminated')) == []
+
+    def test_no_objects(self):
+        """Text without braces yields nothing."""
+        assert list(_iter_json_objects("no json here")) == []
+
+
+class TestExtractJsonFromText:
+    """Tests for extract_json_from_text."""
+
+    def test_code_block(self):
+        """JSON inside a fenced block is parsed."""
+        text = 'Here you go:\n```json\n{"news": [{"title": "x"}]}\n```'
+        assert extract_json_from_text(text) == {"news": [{"title": "x"}]}
+
+    def test_raw_object_with_news(self):
+        """Without a fence, the first top-level object containing "news" is parsed."""
+        text = 'Notes {"other": 1} then {"news": [{"title": "a {b}"}]} done'
+        assert extract_json_from_text(text) == {"news": [{"title": "a {b}"}]}
+
+    def test_no_news(self):
+        """Text without a news object gives None."""
+        assert extract_json_from_text('{"other": 1}') is None
+
+    def test_truncated_json(self):
+        """A final answer cut off mid-object gives None instead of raising."""
+        assert extract_json_from_text('{"news": [{"title": "x"}') is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
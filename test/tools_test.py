@@ -0,0 +1,131 @@
+"""
+Tests for agent_core/tools.py
+
+Covers the trace reader used by get_previous_research_result and the conditional
+requests made by verify_urls (against a local server, no network needed).
+
+Run: pytest test/tools_test.py
+"""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core import tools
+from agent_core.tools import _iter_json_array, _extract_news_from_trace, _verify_single_url
+
+
+class TestIterJsonArray:
+    """Tests for the incremental trace array decoder."""
+
+    def test_items_yielded_in_order(self):
+        """Each top-level item should be decoded in turn."""
+        assert list(_iter_json_array('[{"a": 1}, 2, "x"]')) == [{"a": 1}, 2, "x"]
+
+    def test_empty_array(self):
+        """An empty array yields nothing."""
+        assert list(_iter_json_array("  [ ]  ")) == []
+
+    def test_nested_and_escaped_braces(self):
+        """Brackets and braces inside nested values or strings mustn't end an item early."""
+        content = '[{"text": "a } ] \\" [ {", "parts": [{"b": [1, {"c": "}"}]}]}, {"d": "\\\\"}]'
+        assert list(_iter_json_array(content)) == [
+            {"text": 'a } ] " [ {', "parts": [{"b": [1, {"c": "}"}]}]},
+            {"d": "\\"},
+        ]
+
+    def test_truncated_input_raises_after_complete_items(self):
+        """A cut-off trace yields the complete items, then raises."""
+        items = _iter_json_array('[{"a": 1}, {"b": [1, 2')
+        assert next(items) == {"a": 1}
+        with pytest.raises(json.JSONDecodeError):
+            next(items)
+
+    def test_not_an_array(self):
+        """Anything but a top-level array is rejected."""
+        with pytest.raises(json.JSONDecodeError):
+            list(_iter_json_array('{"a": 1}'))
+
+    def test_extra_data_rejected(self):
+        """Trailing content after the closing bracket is an error."""
+        with pytest.raises(json.JSONDecodeError):
+            list(_iter_json_array('[1, 2] [3]'))
+
+
+class TestExtractNewsFromTrace:
+    """Tests for pulling yesterday's news out of a trace file."""
+
+    def test_latest_text_event_used(self):
+        """The news JSON comes from the latest event that has text."""
+        events = [
+            {"content": {"parts": [{"text": '{"news": [{"title": "old"}]}'}]}},
+            {"content": {"parts": [{"function_call": {"name": "x"}}, {"text": '```json\n{"news": [{"title": "new"}]}\n```'}]}},
+            {"content": {"parts": [{"function_response": {}}]}},
+        ]
+        assert _extract_news_from_trace(json.dumps(events)) == [{"title": "new"}]
+
+    def test_truncated_trace_returns_none(self):
+        """A trace cut off mid-write is treated as having no news."""
+        assert _extract_news_from_trace('[{"content": {"parts": [{"text": "{\\"news\\": []}"}]}}, {"con') is None
+
+
+class TestVerifyConditionalRequests:
+    """verify_urls sends stored validators and treats a 304 as the earlier result."""
+
+    @pytest.fixture(autouse=True)
+    def _clean_validators(self):
+        with patch.dict(tools._verify_validators, clear=True):
+            yield
+
+    def test_head_304_reuses_earlier_result(self, http_server):
+        """The second check sends If-None-Match and accepts the bodiless 304."""
+        http_server.routes["/page"] = (200, {"Content-Type": "text/html", "ETag": '"v1"'}, b"<html>ok</html>")
+        url = http_server.url("/page")
+
+        first = _verify_single_url(url)
+        second = _verify_single_url(url)
+
+        assert first == {"url": url, "valid": True, "status_code": 200}
+        assert second == first
+        method, _, headers = http_server.requests[-1]
+        assert method == "HEAD"
+        assert headers.get("If-None-Match") == '"v1"'
+
+    def test_get_fallback_sends_validators(self, http_server):
+        """When HEAD isn't allowed, the GET fallback carries the validators too."""
+        http_server.routes["/page"] = (200, {"Content-Type": "text/html", "ETag": '"v1"'}, b"<html>ok</html>")
+        http_server.no_head.add("/page")
+        url = http_server.url("/page")
+
+        _verify_single_url(url)
+        second = _verify_single_url(url)
+
+        assert second == {"url": url, "valid": True, "status_code": 200}
+        method, _, headers = http_server.requests[-1]
+        assert method == "GET"
+        assert headers.get("If-None-Match") == '"v1"'
+
+    def test_no_validators_without_earlier_success(self, http_server):
+        """Failed checks store nothing, so the next check is unconditional."""
+        http_server.routes["/gone"] = (410, {"Content-Type": "text/html", "ETag": '"v1"'}, b"")
+        url = http_server.url("/gone")
+
+        assert _verify_single_url(url)["valid"] is False
+        assert url not in tools._verify_validators
+
+    def test_validator_cache_capped(self):
+        """The oldest URL's validators are dropped once the cache is full."""
+        with patch.object(tools, "VERIFY_VALIDATORS_MAX", 2):
+            for i in range(3):
+                tools._remember_validators(f"https://example.com/{i}", f'"{i}"', None, 200)
+
+        assert list(tools._verify_validators) == ["https://example.com/1", "https://example.com/2"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])